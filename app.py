@@ -2,7 +2,10 @@
 
 import streamlit as st
 import pandas as pd
+from collections import Counter
 from datetime import datetime, time as dt_time
+from functools import partial
+import io
 import sys
 import os
 import time
@@ -18,7 +21,7 @@ st.set_page_config(
 
 from modules.file_handler import FileHandler
 from modules.api_client import APIClient
-from modules.email_sender import EmailSender
+from modules.email_sender import EmailSender, BulkSendWorker
 from modules.template_manager import TemplateManager
 from modules.calendar_event import CalendarEvent
 from config.settings import Config
@@ -59,8 +62,316 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# ─── Cached helpers ─────────────────────────────────────────────────────────
+@st.cache_data(show_spinner=False)
+def _sample_students() -> pd.DataFrame:
+    """Tiny example roster shown in the "Download Sample File" expander."""
+    return pd.DataFrame({
+        'Name': ['Alice Smith', 'Bob Johnson', 'Charlie Brown'],
+        'Email': ['alice@example.com', 'bob@example.com', 'charlie@example.com']
+    })
+
+
+@st.cache_data(show_spinner=False)
+def _sample_csv() -> bytes:
+    """CSV bytes for the sample roster download (built once per process)."""
+    return _sample_students().to_csv(index=False).encode('utf-8')
+
+
+@st.cache_data(show_spinner=False)
+def _default_template() -> str:
+    return TemplateManager.get_default_template()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _list_templates() -> list:
+    """Saved templates on disk; the TTL only catches edits made outside the app."""
+    return TemplateManager.list_templates()
+
+
+def _templates_changed():
+    """Drop cached template data after a save/update/delete from the editor."""
+    _list_templates.clear()
+    _default_template.clear()
+
+
+@st.cache_data(show_spinner=False)
+def _placeholders_df(general_mode: bool, has_login_id: bool, has_password: bool) -> pd.DataFrame:
+    return pd.DataFrame(TemplateManager.get_available_placeholders(
+        general_mode=general_mode,
+        has_login_id=has_login_id,
+        has_password=has_password,
+    ))
+
+
+def _credential_flags(rows: list) -> tuple:
+    """(any row has a login_id, any row has a password)"""
+    return any(s.get('login_id') for s in rows), any(s.get('password') for s in rows)
+
+
+def _as_named_buffer(file_bytes: bytes, file_name: str) -> io.BytesIO:
+    """Wrap raw upload bytes so FileHandler can sniff the format from `.name`."""
+    buffer = io.BytesIO(file_bytes)
+    buffer.name = file_name
+    return buffer
+
+
+# Upload caches are keyed on Streamlit's per-upload file_id; the leading underscore
+# keeps the raw bytes out of the cache key so large files are never hashed.
+# Uploads are cached process-wide, so keep only a few and drop them soon after use
+@st.cache_data(max_entries=4, ttl=600, show_spinner=False)
+def _upload_columns(file_id: str, file_name: str, _file_bytes: bytes) -> list:
+    """Column names of an uploaded roster, parsed once per upload."""
+    return FileHandler.get_file_columns(_as_named_buffer(_file_bytes, file_name))
+
+
+def _session_memo(name: str, source, build, extra=None):
+    """Return `build(source)`, recomputing only when `source` is a new object.
+
+    Large lists in session state are keyed by identity (plus length, to catch
+    in-place appends) rather than content-hashed, which for thousands of dicts
+    costs more than the work being cached. `extra` is a small hashable that the
+    result also depends on, compared by equality. Scoped to the current session.
+    """
+    memo = st.session_state.setdefault('_session_memo', {})
+    hit = memo.get(name)
+    if hit is not None and hit[0] is source and hit[1] == len(source) and hit[3] == extra:
+        return hit[2]
+    value = build(source)
+    memo[name] = (source, len(source), value, extra)
+    return value
+
+
+# Arrow-backed str dtype (NaN for missing, like object columns) for the all-text
+# student/result frames. pandas 3 infers it already; older pandas may lack it.
+try:
+    _TEXT_DTYPE = pd.StringDtype('pyarrow', na_value=float('nan'))
+except (TypeError, ImportError):
+    _TEXT_DTYPE = None
+
+
+def _text_frame(rows: list) -> pd.DataFrame:
+    """DataFrame of `rows` with its purely-text object columns stored as Arrow strings."""
+    df = pd.DataFrame(rows)
+    if _TEXT_DTYPE is not None:
+        text_columns = [
+            col for col in df.columns[df.dtypes == object]
+            if pd.api.types.infer_dtype(df[col], skipna=True) == 'string'
+        ]
+        if text_columns:
+            df = df.astype(dict.fromkeys(text_columns, _TEXT_DTYPE))
+    return df
+
+
+def _df(name: str, rows: list) -> pd.DataFrame:
+    """DataFrame view of a session-state list, rebuilt only when the list changes."""
+    return _session_memo(f'df_{name}', rows, _text_frame)
+
+
+def _unique_domains(df: pd.DataFrame) -> int:
+    return df['email'].str.rsplit('@', n=1).str[-1].nunique()
+
+
+def _as_general_recipients(rows: list, program_name: str) -> list:
+    """Recipient rows for General Email Mode (no login links)."""
+    return [
+        {
+            'name': s['name'],
+            'email': s['email'],
+            'candidate_id': '',
+            'login_link': '',
+            'expires_at': '',
+            'program_name': program_name,
+            'round_name': '',
+            'login_id': s.get('login_id', ''),
+            'password': s.get('password', ''),
+            'email_status': 'pending',
+        }
+        for s in rows
+    ]
+
+
+_MANUAL_COLUMNS = ['name', 'email', 'login_id', 'password']
+
+
+def _manual_rows(df: pd.DataFrame) -> list:
+    """Manual-entry table as row dicts, with blank cells as empty strings."""
+    return [
+        {col: '' if pd.isna(value) else str(value) for col, value in row.items()}
+        for row in df[_MANUAL_COLUMNS].to_dict('records')
+    ]
+
+
+def _with_valid_links(rows: list, program_name: str = '') -> list:
+    """Rows that got a login link, with `program_name` overriding theirs when set."""
+    valid = [s for s in rows if s.get('login_link') not in (None, 'N/A', '')]
+    if program_name:
+        # New dicts, so the session-state rows and their cached views stay untouched
+        valid = [{**s, 'program_name': program_name} for s in valid]
+    return valid
+
+
+def _status_counts(rows: list) -> Counter:
+    return Counter(r['email_status'] for r in rows)
+
+
+def _paged_dataframe(df: pd.DataFrame, key: str, page_size: int = 100, **kwargs):
+    """st.dataframe that ships one page of a large frame (full data is in the CSV downloads)."""
+    if len(df) > page_size:
+        pages = -(-len(df) // page_size)
+        if st.session_state.get(key, 1) > pages:
+            st.session_state[key] = pages
+        page = st.number_input(
+            f"Page (of {pages}, {page_size} rows each)",
+            min_value=1, max_value=pages, step=1, key=key,
+        )
+        df = df.iloc[(page - 1) * page_size:page * page_size]
+    st.dataframe(df, **kwargs)
+
+
+def _frame_to_csv(df: pd.DataFrame) -> bytes:
+    """Encode a frame as UTF-8 CSV, written in chunks straight into a byte buffer."""
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, chunksize=10_000, encoding='utf-8')
+    return buffer.getvalue()
+
+
+def _lazy_expander(label: str, key: str):
+    """Collapsed expander plus whether its body needs rendering this run.
+
+    Expanding/collapsing reruns the script, so a collapsed body can be skipped.
+    Streamlit releases without expander state tracking always report it as open.
+    """
+    try:
+        expander = st.expander(label, key=key, on_change='rerun')
+    except TypeError:
+        expander = st.expander(label)
+    return expander, getattr(expander, 'open', None) is not False
+
+
+def _file_reader(path: str):
+    """Download-button data that reads `path` only when the button is clicked."""
+    def read() -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+    return read
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _list_reports(reports_dir: str, dir_mtime: float) -> tuple:
+    """(crash reports by name, other reports newest first) in `reports_dir`.
+
+    Keyed on the directory's mtime, which changes whenever a report is added or removed;
+    the delete buttons also clear it in case the filesystem's mtime is coarse.
+    """
+    with os.scandir(reports_dir) as entries:
+        mtimes = {
+            e.name: e.stat().st_mtime for e in entries
+            if e.name.endswith(('.csv', '.txt')) and not e.name.startswith('checkpoint_')
+        }
+    crash_reports = sorted((f for f in mtimes if f.lower().startswith('crash')), reverse=True)
+    normal_reports = sorted(
+        (f for f in mtimes if not f.lower().startswith('crash')),
+        key=lambda f: (mtimes[f], f), reverse=True
+    )
+    return crash_reports, normal_reports
+
+
+def _rows_to_csv(rows: list) -> bytes:
+    # Download buttons take partial(_rows_to_csv, rows) so the CSV is built only on click
+    return _frame_to_csv(pd.DataFrame(rows))
+
+
+def _failed_rows_to_csv(rows: list) -> bytes:
+    df = pd.DataFrame(rows)
+    return _frame_to_csv(df[df['email_status'] == 'failed'])
+
+
+@st.cache_resource(show_spinner=False)
+def _get_email_sender(aws_access_key: str, aws_secret_key: str, aws_region: str,
+                      sender_email: str, sender_name: str, configuration_set: str = '') -> EmailSender:
+    """One EmailSender (and boto3 SES client) per distinct SES configuration."""
+    return EmailSender({
+        'aws_access_key': aws_access_key,
+        'aws_secret_key': aws_secret_key,
+        'aws_region': aws_region,
+        'sender_email': sender_email,
+        'sender_name': sender_name,
+        'configuration_set': configuration_set,
+    })
+
+
+@st.cache_resource(show_spinner=False)
+def _get_api_client(api_endpoint: str, api_key: str, timeout: int) -> APIClient:
+    """One APIClient (and pooled HTTP session) per endpoint/key."""
+    return APIClient(api_endpoint=api_endpoint, api_key=api_key, timeout=timeout)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_email_tracker(aws_access_key: str, aws_secret_key: str, aws_region: str,
+                       configuration_set: str) -> EmailTracker:
+    """One EmailTracker (and boto3 CloudWatch client) per credentials/region."""
+    return EmailTracker(
+        aws_access_key=aws_access_key,
+        aws_secret_key=aws_secret_key,
+        aws_region=aws_region,
+        configuration_set=configuration_set,
+    )
+
+
+def _ses_config() -> dict:
+    """SES settings from session state (the Tab 1 widgets write straight into it)."""
+    return {
+        'aws_access_key': st.session_state.aws_access_key,
+        'aws_secret_key': st.session_state.aws_secret_key,
+        'aws_region': st.session_state.aws_region,
+        'sender_email': st.session_state.sender_email,
+        'sender_name': st.session_state.sender_name,
+        'configuration_set': Config.AWS_SES_CONFIGURATION_SET,
+    }
+
+
+def _calendar_config():
+    """Calendar event config for send_bulk_emails, or None when no invite is attached."""
+    if not st.session_state.include_calendar_event:
+        return None
+    return {
+        'event_type': st.session_state.calendar_event_type,
+        'title': st.session_state.calendar_event_title,
+        'date_str': st.session_state.calendar_event_date.strftime('%Y-%m-%d') if st.session_state.calendar_event_date else '',
+        'start_time_str': st.session_state.calendar_event_start_time.strftime('%H:%M'),
+        'duration_str': st.session_state.calendar_event_duration or '1 hour',
+        'organizer_name': st.session_state.calendar_event_organizer_name or st.session_state.sender_name,
+        'organizer_email': st.session_state.calendar_event_organizer_email or st.session_state.sender_email,
+        'location': st.session_state.calendar_event_location,
+        'meeting_link': st.session_state.calendar_event_meeting_link,
+        'description': st.session_state.calendar_event_description,
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _calendar_error(**calendar_config):
+    """Validate a calendar config; returns the error message, or None if it builds."""
+    return CalendarEvent.prebuild_template(**calendar_config)[1]
+
+
+# Parsed rosters hold passwords; don't keep them in the process-wide cache for long
+@st.cache_data(max_entries=4, ttl=600, show_spinner="Processing file...")
+def _process_upload(file_id: str, file_name: str, _file_bytes: bytes,
+                    login_id_column: str = '', password_column: str = ''):
+    """Memoized FileHandler.process_file — reruns with the same upload skip parsing."""
+    return FileHandler.process_file(
+        _as_named_buffer(_file_bytes, file_name),
+        login_id_column=login_id_column,
+        password_column=password_column,
+    )
+
+
 # ─── Initialize session state ───────────────────────────────────────────────
 def init_session_state():
+    # Defaults only need seeding once per session; later reruns skip building them
+    if st.session_state.get('_session_initialized'):
+        return
     defaults = {
         'students': [],
         'students_with_links': [],
@@ -69,7 +380,9 @@ def init_session_state():
         'emails_sent': False,
         'email_results': [],
         'file_errors': [],
-        'email_template': TemplateManager.get_default_template(),
+        # (file_id, login ID column, password column) of the upload loaded into `students`
+        'upload_key': None,
+        'email_template': _default_template(),
         'email_subject': 'Assessment Link & Login Credentials | TAM – Digital Banking | 28 February',
         'program_id': int(Config.DEFAULT_PROGRAM_ID) if Config.DEFAULT_PROGRAM_ID else 1,
         'round_id': int(Config.DEFAULT_ROUND_ID) if Config.DEFAULT_ROUND_ID else 1,
@@ -108,6 +421,7 @@ def init_session_state():
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
+    st.session_state._session_initialized = True
 
 
 init_session_state()
@@ -167,42 +481,37 @@ with tab1:
     with col1:
         api_endpoint = st.text_input(
             "API Endpoint URL *",
-            value=st.session_state.api_endpoint,
+            key='api_endpoint',
             help="The URL for the link generation API"
         )
-        st.session_state.api_endpoint = api_endpoint
 
         program_id = st.number_input(
             "Program ID *",
             min_value=1,
-            value=st.session_state.program_id,
+            key='program_id',
             help="The program ID for link generation"
         )
-        st.session_state.program_id = program_id
 
     with col2:
         round_id = st.number_input(
             "Round ID *",
             min_value=1,
-            value=st.session_state.round_id,
+            key='round_id',
             help="The round ID for link generation"
         )
-        st.session_state.round_id = round_id
 
         session_time = st.text_input(
             "Session Time *",
-            value=st.session_state.session_time,
+            key='session_time',
             help="Duration the link remains valid (e.g., 730h)"
         )
-        st.session_state.session_time = session_time
 
         api_key = st.text_input(
             "API Key *",
-            value=st.session_state.api_key,
+            key='api_key',
             type="password",
             help="API key for authentication"
         )
-        st.session_state.api_key = api_key
 
     st.markdown("---")
     st.subheader("📧 AWS SES Email Configuration")
@@ -213,58 +522,47 @@ with tab1:
     with col3:
         aws_access_key = st.text_input(
             "AWS SES Access Key *",
-            value=st.session_state.aws_access_key,
+            key='aws_access_key',
             type="password",
             help="AWS IAM access key with SES permissions"
         )
-        st.session_state.aws_access_key = aws_access_key
 
         aws_secret_key = st.text_input(
             "AWS SES Secret Key *",
-            value=st.session_state.aws_secret_key,
+            key='aws_secret_key',
             type="password",
             help="AWS IAM secret key"
         )
-        st.session_state.aws_secret_key = aws_secret_key
 
         aws_region = st.text_input(
             "AWS Region",
-            value=st.session_state.aws_region,
+            key='aws_region',
             help="e.g., ap-south-1, us-east-1"
         )
-        st.session_state.aws_region = aws_region
 
     with col4:
         sender_email = st.text_input(
             "Sender Email *",
-            value=st.session_state.sender_email,
+            key='sender_email',
             help="Verified SES sender email (e.g., noreply_gr@ppl.how)"
         )
-        st.session_state.sender_email = sender_email
 
         sender_name = st.text_input(
             "Sender Name",
-            value=st.session_state.sender_name,
+            key='sender_name',
             help="Name displayed as the sender"
         )
-        st.session_state.sender_name = sender_name
 
     # Test AWS SES connection
     if st.button("🔌 Test AWS SES Connection"):
         if not aws_access_key or not aws_secret_key:
             st.error("Please enter your AWS access key and secret key first.")
         else:
-            ses_config = {
-                'aws_access_key': aws_access_key,
-                'aws_secret_key': aws_secret_key,
-                'aws_region': aws_region,
-                'sender_email': sender_email,
-                'sender_name': sender_name,
-                'configuration_set': Config.AWS_SES_CONFIGURATION_SET,
-            }
             with st.spinner("Testing AWS SES connection..."):
-                email_sender = EmailSender(ses_config)
+                email_sender = _get_email_sender(**_ses_config())
                 success, message = email_sender.test_connection()
+                if success:
+                    st.session_state.ses_max_send_rate = email_sender.get_max_send_rate()
 
             if success:
                 st.success(f"✅ {message}")
@@ -300,21 +598,17 @@ with tab2:
         key="input_method"
     )
 
+    uploaded_file = None
     if input_method == "📁 Upload File":
         # Sample data download
         with st.expander("📥 Download Sample File"):
-            sample_df = pd.DataFrame({
-                'Name': ['Alice Smith', 'Bob Johnson', 'Charlie Brown'],
-                'Email': ['alice@example.com', 'bob@example.com', 'charlie@example.com']
-            })
-            csv_data = sample_df.to_csv(index=False)
             st.download_button(
                 label="Download Sample CSV",
-                data=csv_data,
+                data=_sample_csv(),
                 file_name="sample_students.csv",
                 mime="text/csv"
             )
-            st.dataframe(sample_df, use_container_width=True)
+            st.dataframe(_sample_students(), use_container_width=True)
 
         uploaded_file = st.file_uploader(
             "Choose a CSV or Excel file",
@@ -324,9 +618,8 @@ with tab2:
 
         if uploaded_file is not None:
             # Read file columns for optional mapping
-            uploaded_file.seek(0)
-            file_columns = FileHandler.get_file_columns(uploaded_file)
-            uploaded_file.seek(0)
+            file_bytes = uploaded_file.getvalue()
+            file_columns = _upload_columns(uploaded_file.file_id, uploaded_file.name, file_bytes)
 
             # Optional login_id and password column pickers
             none_option = '— None —'
@@ -351,12 +644,22 @@ with tab2:
             selected_login_id_col = '' if login_id_col == none_option else login_id_col
             selected_password_col = '' if password_col == none_option else password_col
 
-            with st.spinner("Processing file..."):
-                students, errors = FileHandler.process_file(
-                    uploaded_file,
+            # Parse only when the upload or column choice changes; otherwise reuse the loaded roster
+            upload_key = (uploaded_file.file_id, selected_login_id_col, selected_password_col)
+            if upload_key == st.session_state.upload_key:
+                students, errors = st.session_state.students, st.session_state.file_errors
+            else:
+                students, errors = _process_upload(
+                    uploaded_file.file_id,
+                    uploaded_file.name,
+                    file_bytes,
                     login_id_column=selected_login_id_col,
                     password_column=selected_password_col,
                 )
+                if students:
+                    st.session_state.students = students
+                    st.session_state.file_errors = errors
+                    st.session_state.upload_key = upload_key
 
             # Show errors
             if errors:
@@ -366,14 +669,11 @@ with tab2:
 
             # Show valid students
             if students:
-                st.session_state.students = students
-                st.session_state.file_errors = errors
-
                 st.success(f"✅ Successfully loaded **{len(students)}** valid student(s)")
 
                 # Preview
-                preview_df = pd.DataFrame(students)
-                st.dataframe(preview_df, use_container_width=True, height=300)
+                preview_df = _df('students', students)
+                _paged_dataframe(preview_df, 'page_upload_preview', use_container_width=True, height=300)
 
                 # Stats
                 col1, col2, col3 = st.columns(3)
@@ -382,14 +682,18 @@ with tab2:
                 with col2:
                     st.metric("Warnings/Errors", len(errors))
                 with col3:
-                    unique_domains = len(set(s['email'].split('@')[1] for s in students))
+                    unique_domains = _session_memo(
+                        'unique_domains', students, lambda rows: _unique_domains(_df('students', rows))
+                    )
                     st.metric("Unique Email Domains", unique_domains)
             else:
                 st.error("No valid students found in the uploaded file.")
 
     else:
         # ── Manual Input ────────────────────────────────────────────────────
-        st.markdown("Enter student **Name** and **Email** below. **Login ID** and **Password** are optional. Click ➕ to add more rows.")
+        st.markdown("Enter student **Name** and **Email** below. **Login ID** and **Password** are optional. Use the **+** under the table to add rows.")
+
+        manual_fill = None
 
         # ── Quick Search from User Data ─────────────────────────────────────
         user_data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'user-data')
@@ -507,22 +811,11 @@ with tab2:
                                     if r_candidate:
                                         btn_label += f"  |  ID: {r_candidate}"
                                     if st.button(btn_label, key=f"search_result_{i}", use_container_width=True):
-                                        # Find the first empty row or add a new one
-                                        rows = st.session_state.manual_entry_rows
-                                        target_idx = None
-                                        for ri, r in enumerate(rows):
-                                            if not r.get('name', '').strip() and not r.get('email', '').strip():
-                                                target_idx = ri
-                                                break
-                                        if target_idx is None:
-                                            rows.append({'name': '', 'email': '', 'login_id': '', 'password': ''})
-                                            target_idx = len(rows) - 1
-
-                                        rows[target_idx]['name'] = r_name
-                                        rows[target_idx]['email'] = r_email
-                                        rows[target_idx]['login_id'] = r_login
-                                        rows[target_idx]['password'] = r_pass
-                                        st.rerun()
+                                        # Applied to the entry table once it has rendered below
+                                        manual_fill = {
+                                            'name': r_name, 'email': r_email,
+                                            'login_id': r_login, 'password': r_pass,
+                                        }
                             else:
                                 st.info("No matching users found.")
                     else:
@@ -530,49 +823,34 @@ with tab2:
                 except Exception as e:
                     st.error(f"Error reading user data file: {e}")
 
-        rows = st.session_state.manual_entry_rows
-
-        for idx in range(len(rows)):
-            col_name, col_email, col_login, col_pass, col_del = st.columns([2.5, 3, 2, 2, 0.5])
-            with col_name:
-                rows[idx]['name'] = st.text_input(
-                    "Name", value=rows[idx].get('name', ''),
-                    key=f"manual_name_{idx}",
-                    placeholder="e.g. Alice Smith",
-                    label_visibility="collapsed" if idx > 0 else "visible"
-                )
-            with col_email:
-                rows[idx]['email'] = st.text_input(
-                    "Email", value=rows[idx].get('email', ''),
-                    key=f"manual_email_{idx}",
-                    placeholder="e.g. alice@example.com",
-                    label_visibility="collapsed" if idx > 0 else "visible"
-                )
-            with col_login:
-                rows[idx]['login_id'] = st.text_input(
-                    "Login ID (optional)", value=rows[idx].get('login_id', ''),
-                    key=f"manual_login_id_{idx}",
-                    placeholder="e.g. user123",
-                    label_visibility="collapsed" if idx > 0 else "visible"
-                )
-            with col_pass:
-                rows[idx]['password'] = st.text_input(
-                    "Password (optional)", value=rows[idx].get('password', ''),
-                    key=f"manual_password_{idx}",
-                    placeholder="e.g. pass@123",
-                    label_visibility="collapsed" if idx > 0 else "visible"
-                )
-            with col_del:
-                if idx == 0:
-                    st.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
-                if len(rows) > 1:
-                    if st.button("🗑️", key=f"manual_del_{idx}", help="Remove this row"):
-                        rows.pop(idx)
-                        st.rerun()
-
-        # Add row button
-        if st.button("➕ Add Another", key="add_manual_row"):
-            rows.append({'name': '', 'email': '', 'login_id': '', 'password': ''})
+        # One data_editor for all rows (instead of four text inputs per row). Its edits
+        # live under a versioned key; the base rows are only replaced (and the
+        # version bumped) when a search result is filled in.
+        editor_version = st.session_state.get('manual_editor_version', 0)
+        edited_df = st.data_editor(
+            pd.DataFrame(st.session_state.manual_entry_rows, columns=_MANUAL_COLUMNS),
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            key=f"manual_editor_{editor_version}",
+            column_config={
+                'name': st.column_config.TextColumn("Name", help="e.g. Alice Smith"),
+                'email': st.column_config.TextColumn("Email", help="e.g. alice@example.com"),
+                'login_id': st.column_config.TextColumn("Login ID (optional)", help="e.g. user123"),
+                'password': st.column_config.TextColumn("Password (optional)", help="e.g. pass@123"),
+            },
+        )
+        rows = _manual_rows(edited_df)
+
+        if manual_fill:
+            # Fill the first empty row or add a new one
+            target = next((r for r in rows if not r['name'].strip() and not r['email'].strip()), None)
+            if target is None:
+                target = dict.fromkeys(_MANUAL_COLUMNS, '')
+                rows.append(target)
+            target.update(manual_fill)
+            st.session_state.manual_entry_rows = rows
+            st.session_state.manual_editor_version = editor_version + 1
             st.rerun()
 
         st.markdown("---")
@@ -622,6 +900,7 @@ with tab2:
             if manual_students:
                 st.session_state.students = manual_students
                 st.session_state.file_errors = manual_errors
+                st.session_state.upload_key = None
                 st.success(f"✅ Successfully loaded **{len(manual_students)}** student(s)")
 
                 preview_df = pd.DataFrame(manual_students)
@@ -631,10 +910,13 @@ with tab2:
 
     # Show previously loaded data regardless of input method
     if input_method == "📁 Upload File" and st.session_state.students:
-        if not (uploaded_file if 'uploaded_file' in dir() else None):
+        if uploaded_file is None:
             st.info(f"📄 Previously loaded: **{len(st.session_state.students)}** student(s)")
-            preview_df = pd.DataFrame(st.session_state.students)
-            st.dataframe(preview_df, use_container_width=True, height=200)
+            expander, expanded = _lazy_expander("👀 Show loaded students", 'exp_loaded_students')
+            if expanded:
+                with expander:
+                    preview_df = _df('students', st.session_state.students)
+                    _paged_dataframe(preview_df, 'page_loaded_students', use_container_width=True, height=200)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -661,14 +943,14 @@ if tab3 is not None:
             if st.button("🚀 Generate Links from API", type="primary"):
                 emails = [s['email'] for s in st.session_state.students]
 
-                api_client = APIClient(
-                    api_endpoint=st.session_state.api_endpoint,
-                    api_key=st.session_state.api_key,
-                    timeout=Config.API_TIMEOUT
+                api_client = _get_api_client(
+                    st.session_state.api_endpoint,
+                    st.session_state.api_key,
+                    Config.API_TIMEOUT
                 )
 
                 with st.spinner("Calling API to generate links..."):
-                    success, response_data, error_msg = api_client.generate_links(
+                    success, response_data, error_msg = api_client.generate_links_batched(
                         emails=emails,
                         program_id=st.session_state.program_id,
                         round_id=st.session_state.round_id,
@@ -694,10 +976,10 @@ if tab3 is not None:
                         st.success(f"✅ Successfully generated links for **{len(students_with_links)}** out of {len(st.session_state.students)} student(s)!")
 
                         st.subheader("📋 Candidates With Links (Will Receive Email)")
-                        result_df = pd.DataFrame(students_with_links)
-                        st.dataframe(result_df, use_container_width=True, height=400)
+                        result_df = _df('students_with_links', students_with_links)
+                        _paged_dataframe(result_df, 'page_new_links', use_container_width=True, height=400)
 
-                        csv_data = result_df.to_csv(index=False)
+                        csv_data = partial(_rows_to_csv, students_with_links)
                         st.download_button(
                             label="📥 Download Successful Links CSV",
                             data=csv_data,
@@ -713,10 +995,10 @@ if tab3 is not None:
                         st.subheader("🚫 Failed Candidates (Will NOT Receive Email)")
                         st.warning(f"{len(failed_candidates)} candidate(s) could not be found in the exam portal. No email will be sent to them.")
 
-                        failed_df = pd.DataFrame(failed_candidates)
+                        failed_df = _df('failed_candidates', failed_candidates)
                         st.dataframe(failed_df, use_container_width=True, height=300)
 
-                        failed_csv = failed_df.to_csv(index=False)
+                        failed_csv = partial(_rows_to_csv, failed_candidates)
                         st.download_button(
                             label="📥 Download Failed Candidates CSV",
                             data=failed_csv,
@@ -732,20 +1014,30 @@ if tab3 is not None:
                 if st.session_state.students_with_links:
                     st.markdown("---")
                     st.subheader("📋 Previously Generated Links")
-                    result_df = pd.DataFrame(st.session_state.students_with_links)
-                    st.dataframe(result_df, use_container_width=True, height=300)
+                    expander, expanded = _lazy_expander(
+                        f"👀 Show {len(st.session_state.students_with_links)} generated link(s)",
+                        'exp_previous_links',
+                    )
+                    if expanded:
+                        with expander:
+                            result_df = _df('students_with_links', st.session_state.students_with_links)
+                            _paged_dataframe(result_df, 'page_previous_links', use_container_width=True, height=300)
 
                 if st.session_state.failed_candidates:
                     st.markdown("---")
                     st.subheader("🚫 Previously Failed Candidates")
-                    failed_df = pd.DataFrame(st.session_state.failed_candidates)
+                    failed_df = _df('failed_candidates', st.session_state.failed_candidates)
                     st.dataframe(failed_df, use_container_width=True, height=200)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 4: Email Template
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab4:
+# A fragment: editing the subject/template reruns only this tab (editor + preview).
+# Everything else reads the mirrored session state on the next full rerun, and
+# Load/Save/Delete/Reset still call st.rerun() for a full-app refresh.
+@st.fragment
+def _render_template_tab():
     st.header("Step 4: Customize Email Template")
 
     col_template, col_preview = st.columns([1, 1])
@@ -760,7 +1052,7 @@ with tab4:
         )
 
         # ── Load a saved template ───────────────────────────────────────────
-        available_templates = TemplateManager.list_templates()
+        available_templates = _list_templates()
         if available_templates:
             template_names = [t['name'] for t in available_templates]
             current_index = (
@@ -790,6 +1082,7 @@ with tab4:
 
                 if delete_clicked:
                     TemplateManager.delete_template(chosen['filename'])
+                    _templates_changed()
                     st.session_state.loaded_template_filename = None
                     st.toast(f"Deleted template '{selected_template}'", icon="🗑️")
                     st.rerun()
@@ -847,6 +1140,7 @@ with tab4:
                              use_container_width=True,
                              help=f"Overwrite '{loaded_name}' with the current subject & HTML."):
                     TemplateManager.update_template(loaded_fn, email_subject, email_template)
+                    _templates_changed()
                     st.toast(f"Saved '{loaded_name}'", icon="✅")
                     st.rerun()
         else:
@@ -862,7 +1156,7 @@ with tab4:
                     st.session_state.email_template = TemplateManager.get_general_email_template()
                     st.session_state.email_subject = 'Invitation to Online Assessment | TAM – Digital Banking | 26 February'
                 else:
-                    st.session_state.email_template = TemplateManager.get_default_template()
+                    st.session_state.email_template = _default_template()
                     st.session_state.email_subject = 'Assessment Link & Login Credentials | TAM – Digital Banking | 26 February'
                 st.session_state.loaded_template_filename = None
                 st.session_state.template_editor_key += 1
@@ -886,6 +1180,7 @@ with tab4:
                             new_fn = TemplateManager.save_template(
                                 save_as_name, email_subject, email_template
                             )
+                            _templates_changed()
                             st.session_state.loaded_template_filename = new_fn
                             st.session_state.show_save_as = False
                             st.toast(f"Saved new template '{save_as_name.strip()}'", icon="✅")
@@ -907,18 +1202,15 @@ with tab4:
         st.session_state.visual_editor_active = visual_mode
 
         # Detect if students have login_id / password
-        _students_data = st.session_state.get('students', [])
-        _has_login_id = any(s.get('login_id') for s in _students_data)
-        _has_password = any(s.get('password') for s in _students_data)
+        _has_login_id, _has_password = _session_memo(
+            'credential_flags', st.session_state.get('students', []), _credential_flags
+        )
 
         # Available placeholders
         with st.expander("📌 Available Placeholders"):
-            placeholders = TemplateManager.get_available_placeholders(
-                general_mode=st.session_state.get('skip_link_generation', False),
-                has_login_id=_has_login_id,
-                has_password=_has_password,
+            placeholder_df = _placeholders_df(
+                st.session_state.get('skip_link_generation', False), _has_login_id, _has_password
             )
-            placeholder_df = pd.DataFrame(placeholders)
             st.table(placeholder_df)
 
         if visual_mode:
@@ -944,23 +1236,308 @@ with tab4:
                 sample_data['program_name'] = st.session_state.custom_program_name
 
             # Replace placeholders in subject
-            preview_subject = email_subject
-            for key, value in sample_data.items():
-                preview_subject = preview_subject.replace(f'{{{key}}}', str(value))
+            preview_subject = TemplateManager.fill_placeholders(email_subject, sample_data)
 
             st.markdown(f"**Subject:** {preview_subject}")
 
             # Replace placeholders in template
-            preview_html = email_template
-            for key, value in sample_data.items():
-                preview_html = preview_html.replace(f'{{{key}}}', str(value))
+            preview_html = TemplateManager.fill_placeholders(email_template, sample_data)
 
             st.components.v1.html(preview_html, height=600, scrolling=True)
 
 
+with tab4:
+    _render_template_tab()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 5: Send Emails
 # ═══════════════════════════════════════════════════════════════════════════════
+# Sending runs on a BulkSendWorker thread and a polling fragment drains its progress
+# events, so clicking a widget mid-send reruns the script without interrupting the send.
+def _start_send_job(kind: str, sender: EmailSender, students: list, counts: dict, **send_kwargs):
+    st.session_state.send_job = {
+        'kind': kind,
+        'worker': BulkSendWorker(sender, students=students, **send_kwargs),
+        'total': len(students),
+        'counts': counts,
+        'current': counts['sent'] + counts['failed'],
+        'last': '',
+    }
+
+
+def _resume_send(students: list, resumable_session: dict):
+    """on_click for Resume Sending: runs before the script, so the rerun already shows progress."""
+    if not st.session_state.aws_access_key or not st.session_state.aws_secret_key:
+        st.session_state.resume_error = "❌ Please configure AWS SES credentials first."
+        return
+    resume_sender = _get_email_sender(**_ses_config())
+    conn_ok, conn_msg = resume_sender.test_connection()
+    if not conn_ok:
+        st.session_state.resume_error = f"❌ AWS SES connection failed: {conn_msg}"
+        return
+    _start_send_job(
+        'resume', resume_sender, students,
+        {'sent': resumable_session['sent'], 'failed': resumable_session['failed']},
+        subject=st.session_state.email_subject,
+        html_template=st.session_state.email_template,
+        delay=float(Config.DELAY_BETWEEN_EMAILS),
+        calendar_event_config=_calendar_config(),
+        checkpoint_interval=10,
+        resume_from_checkpoint=True,
+        max_workers=st.session_state.get('parallel_sends', Config.MAX_PARALLEL_SENDS),
+        max_retries=Config.MAX_RETRIES,
+    )
+
+
+def _send_job_progress():
+    job = st.session_state.get('send_job')
+    if not job:
+        return
+    worker = job['worker']
+    done = worker.done  # check before draining so no final events are missed
+    counts = job['counts']
+    for current, total, email, success, message in worker.drain():
+        if not email.startswith("(resumed"):
+            counts['sent' if success else 'failed'] += 1
+        job['current'] = current
+        job['last'] = f"{'✅' if success else '❌'} {email}"
+
+    st.progress(job['current'] / job['total'] if job['total'] else 1.0)
+    st.markdown(
+        f"**Progress:** {job['current']}/{job['total']} | "
+        f"✅ Sent: {counts['sent']} | ❌ Failed: {counts['failed']} | "
+        f"Last: {job['last']}"
+    )
+
+    if done:
+        results = worker.results
+        if worker.error is not None and job['kind'] == 'send':
+            # Load partial results from the checkpoint
+            if EmailSender.get_resumable_session():
+                checkpoint_data = EmailSender._load_latest_checkpoint()
+                if checkpoint_data:
+                    results = checkpoint_data.get('results', [])
+        if results:
+            st.session_state.email_results = results
+            st.session_state.emails_sent = True
+        st.session_state.send_outcome = {
+            'kind': job['kind'],
+            'counts': counts,
+            'total': job['total'],
+            'error': str(worker.error) if worker.error is not None else None,
+            'complete': bool(results) and len(results) == job['total'],
+        }
+        del st.session_state['send_job']
+        st.rerun()
+
+
+def _render_send_job(kind: str):
+    """Show live progress for a running send of this kind, or its outcome once it finished."""
+    job = st.session_state.get('send_job')
+    if job and job['kind'] == kind:
+        st.fragment(run_every=0.5)(_send_job_progress)()
+
+    outcome = st.session_state.get('send_outcome')
+    if not outcome or outcome['kind'] != kind:
+        return
+    del st.session_state['send_outcome']
+    counts = outcome['counts']
+
+    if kind == 'resume':
+        if outcome['error']:
+            st.error(f"⚠️ Crashed again: {outcome['error']}. Progress saved — you can resume again.")
+        else:
+            st.success(f"✅ Resume complete! Sent: {counts['sent']} | Failed: {counts['failed']}")
+            st.balloons()
+        return
+
+    if outcome['error']:
+        st.error(
+            f"⚠️ **Email sending crashed after {counts['sent'] + counts['failed']} emails!**\n\n"
+            f"**Error:** {outcome['error']}\n\n"
+            f"✅ Sent: {counts['sent']} | ❌ Failed: {counts['failed']} | "
+            f"📭 Not sent: {outcome['total'] - counts['sent'] - counts['failed']}\n\n"
+            f"📁 A crash report has been auto-saved to the `reports/` folder.\n\n"
+            f"🔄 **You can resume sending** from where it stopped — reload the app and use the Resume button."
+        )
+
+    # Final summary
+    st.markdown("---")
+    st.subheader("📊 Sending Complete!")
+
+    summary_col1, summary_col2, summary_col3 = st.columns(3)
+    with summary_col1:
+        st.metric("Total Emails", counts['sent'] + counts['failed'])
+    with summary_col2:
+        st.metric("Successfully Sent", counts['sent'])
+    with summary_col3:
+        st.metric("Failed", counts['failed'])
+
+    if counts['failed'] > 0:
+        st.warning("Some emails failed to send. Check the Reports tab for details.")
+
+    if outcome['complete']:
+        st.balloons()
+
+
+# A fragment: editing the event fields reruns only this section (and its cached
+# validity check); sending reads the mirrored session state via _calendar_config().
+@st.fragment
+def _render_calendar_section():
+    st.subheader("📅 Calendar Event (Optional)")
+    st.markdown(
+        "Attach a calendar invite to each email so recipients can add the exam session "
+        "to their calendar. Supported formats: **Google Meet** and **Outlook / Microsoft Teams**."
+    )
+
+    include_event = st.checkbox(
+        "Include calendar event (attach .ics invite to each email)",
+        value=st.session_state.include_calendar_event,
+    )
+    st.session_state.include_calendar_event = include_event
+
+    if include_event:
+        st.markdown("**Select event type:**")
+        event_type_choice = st.radio(
+            "Calendar Platform",
+            options=[CalendarEvent.EVENT_TYPE_GOOGLE, CalendarEvent.EVENT_TYPE_OUTLOOK],
+            format_func=CalendarEvent.get_event_type_label,
+            index=0 if st.session_state.calendar_event_type == CalendarEvent.EVENT_TYPE_GOOGLE else 1,
+            horizontal=True,
+            label_visibility="collapsed",
+        )
+        st.session_state.calendar_event_type = event_type_choice
+
+        st.markdown("**Event Details** *(fill in as plain text)*")
+
+        ev_col1, ev_col2 = st.columns(2)
+
+        with ev_col1:
+            ev_title = st.text_input(
+                "Event Title *",
+                value=st.session_state.calendar_event_title,
+                placeholder="e.g. Software Engineering Exam",
+                help="Title of the calendar event",
+            )
+            st.session_state.calendar_event_title = ev_title
+
+            ev_date = st.date_input(
+                "Event Date *",
+                value=st.session_state.calendar_event_date,
+                format="YYYY-MM-DD",
+                help="Select the date of the exam session",
+            )
+            st.session_state.calendar_event_date = ev_date
+
+            ev_start_time = st.time_input(
+                "Start Time *",
+                value=st.session_state.calendar_event_start_time,
+                step=300,
+                help="Select the start time (5-minute increments)",
+            )
+            st.session_state.calendar_event_start_time = ev_start_time
+
+            st.markdown(r"**Duration \*:**")
+            dur_col_h, dur_col_m = st.columns(2)
+            with dur_col_h:
+                ev_dur_hours = st.number_input(
+                    "Hours",
+                    min_value=0,
+                    max_value=23,
+                    value=st.session_state.calendar_event_duration_hours,
+                    step=1,
+                )
+                st.session_state.calendar_event_duration_hours = ev_dur_hours
+            with dur_col_m:
+                ev_dur_mins = st.number_input(
+                    "Minutes",
+                    min_value=0,
+                    max_value=55,
+                    value=st.session_state.calendar_event_duration_minutes,
+                    step=5,
+                )
+                st.session_state.calendar_event_duration_minutes = ev_dur_mins
+
+            # Compose duration string for the ICS generator
+            if ev_dur_hours > 0 and ev_dur_mins > 0:
+                ev_duration = f"{ev_dur_hours}h {ev_dur_mins}m"
+            elif ev_dur_hours > 0:
+                ev_duration = f"{ev_dur_hours}h"
+            elif ev_dur_mins > 0:
+                ev_duration = f"{ev_dur_mins}m"
+            else:
+                ev_duration = "1h"  # fallback
+            st.session_state.calendar_event_duration = ev_duration
+
+        with ev_col2:
+            ev_organizer_name = st.text_input(
+                "Organizer Name",
+                value=st.session_state.calendar_event_organizer_name or st.session_state.sender_name,
+                placeholder="e.g. Exam Portal Team",
+                help="Name of the event organizer (defaults to sender name)",
+            )
+            st.session_state.calendar_event_organizer_name = ev_organizer_name
+
+            ev_organizer_email = st.text_input(
+                "Organizer Email",
+                value=st.session_state.calendar_event_organizer_email or st.session_state.sender_email,
+                placeholder="e.g. exams@yourcompany.com",
+                help="Organizer's email address (defaults to sender email)",
+            )
+            st.session_state.calendar_event_organizer_email = ev_organizer_email
+
+            ev_meeting_link = st.text_input(
+                "Meeting Link",
+                value=st.session_state.calendar_event_meeting_link,
+                placeholder=(
+                    "e.g. https://meet.google.com/abc-xyz"
+                    if event_type_choice == CalendarEvent.EVENT_TYPE_GOOGLE
+                    else "e.g. https://teams.microsoft.com/..."
+                ),
+                help="Video conference URL (Google Meet or Teams link)",
+            )
+            st.session_state.calendar_event_meeting_link = ev_meeting_link
+
+            ev_location = st.text_input(
+                "Physical Location (optional)",
+                value=st.session_state.calendar_event_location,
+                placeholder="e.g. Room 101, Main Building",
+                help="Physical location or leave blank if online only",
+            )
+            st.session_state.calendar_event_location = ev_location
+
+        ev_description = st.text_area(
+            "Event Description (optional)",
+            value=st.session_state.calendar_event_description,
+            placeholder="e.g. Please join this session for your exam. Make sure you have a stable internet connection.",
+            height=80,
+            help="Additional instructions or notes for attendees",
+        )
+        st.session_state.calendar_event_description = ev_description
+
+        # Validate required fields and show preview
+        missing_event_fields = []
+        if not ev_title.strip():
+            missing_event_fields.append("Event Title")
+        if ev_date is None:
+            missing_event_fields.append("Event Date")
+
+        if missing_event_fields:
+            st.warning(f"⚠️ Calendar event is missing: {', '.join(missing_event_fields)}")
+        else:
+            _sample_err = _calendar_error(**_calendar_config())
+            if _sample_err:
+                st.error(f"❌ Calendar event error: {_sample_err}")
+            else:
+                platform_label = CalendarEvent.get_event_type_label(event_type_choice)
+                st.success(
+                    f"✅ Calendar invite ready — **{platform_label}** event "
+                    f"**'{ev_title}'** on **{ev_date.strftime('%d %b %Y')}** at **{ev_start_time.strftime('%H:%M')}** "
+                    f"for **{ev_duration}**. Each recipient will receive a personalised .ics attachment."
+                )
+
+
 with tab5:
     if st.session_state.skip_link_generation:
         st.header("Send Emails")
@@ -979,26 +1556,21 @@ with tab5:
             st.warning("⚠️ Please generate links first (Tab 3).")
 
     if _ready_to_send:
-        # Build list of students to email
+        # Build list of students to email (with the custom program name applied)
+        program_name = st.session_state.custom_program_name or ''
         if st.session_state.skip_link_generation:
             # Prepare students without links — just name & email (+ optional login_id/password)
-            students_to_email = [
-                {
-                    'name': s['name'],
-                    'email': s['email'],
-                    'candidate_id': '',
-                    'login_link': '',
-                    'expires_at': '',
-                    'program_name': st.session_state.custom_program_name or '',
-                    'round_name': '',
-                    'login_id': s.get('login_id', ''),
-                    'password': s.get('password', ''),
-                    'email_status': 'pending',
-                }
-                for s in st.session_state.students
-            ]
+            students_to_email = _session_memo(
+                'general_recipients', st.session_state.students,
+                lambda rows: _as_general_recipients(rows, program_name),
+                extra=program_name,
+            )
         else:
-            students_to_email = [s for s in st.session_state.students_with_links if s.get('login_link') not in (None, 'N/A', '')]
+            students_to_email = _session_memo(
+                'linked_recipients', st.session_state.students_with_links,
+                lambda rows: _with_valid_links(rows, program_name),
+                extra=program_name,
+            )
 
         if not students_to_email:
             if st.session_state.skip_link_generation:
@@ -1030,7 +1602,10 @@ with tab5:
         st.markdown("---")
 
         # ── Resume from Crash Section ──────────────────────────────────────────
-        resumable_session = EmailSender.get_resumable_session()
+        _render_send_job('resume')
+        sending = 'send_job' in st.session_state
+        # A running send's own checkpoint looks resumable — don't offer it while sending
+        resumable_session = None if sending else EmailSender.get_resumable_session()
         if resumable_session:
             st.markdown("---")
             st.subheader("🔄 Resume Previous Session")
@@ -1043,82 +1618,23 @@ with tab5:
                 f"- **Started at:** {resumable_session['started_at']}"
                 + (f"\n- **Error:** {resumable_session['crash_error']}" if resumable_session.get('crash_error') else "")
             )
+            if resumable_session['status'] == 'in_progress':
+                # The app was stopped outright, so sends after the last checkpoint weren't recorded
+                parallel_sends = st.session_state.get('parallel_sends', Config.MAX_PARALLEL_SENDS)
+                st.caption(
+                    f"The app stopped without saving a final checkpoint. Resuming re-sends the emails "
+                    f"that went out after the last one: up to {10 + 2 * parallel_sends} individual "
+                    f"emails, or {parallel_sends} batches of 50 for bulk sends."
+                )
 
             resume_col1, resume_col2 = st.columns(2)
             with resume_col1:
-                if st.button("🔄 Resume Sending", type="primary"):
-                    if not st.session_state.aws_access_key or not st.session_state.aws_secret_key:
-                        st.error("❌ Please configure AWS SES credentials first.")
-                    else:
-                        ses_config = {
-                            'aws_access_key': st.session_state.aws_access_key,
-                            'aws_secret_key': st.session_state.aws_secret_key,
-                            'aws_region': st.session_state.aws_region,
-                            'sender_email': st.session_state.sender_email,
-                            'sender_name': st.session_state.sender_name,
-                            'configuration_set': Config.AWS_SES_CONFIGURATION_SET,
-                        }
-                        resume_sender = EmailSender(ses_config)
-
-                        with st.spinner("Testing AWS SES connection..."):
-                            conn_ok, conn_msg = resume_sender.test_connection()
-
-                        if not conn_ok:
-                            st.error(f"❌ AWS SES connection failed: {conn_msg}")
-                        else:
-                            st.success(f"✅ Connected! Resuming from email {resumable_session['processed'] + 1}...")
-
-                            resume_progress = st.progress(resumable_session['processed'] / resumable_session['total'])
-                            resume_status = st.empty()
-                            resume_counts = {'sent': resumable_session['sent'], 'failed': resumable_session['failed']}
-
-                            def resume_progress_callback(current, total, email, success, message):
-                                if not email.startswith("(resumed"):
-                                    if success:
-                                        resume_counts['sent'] += 1
-                                    else:
-                                        resume_counts['failed'] += 1
-                                progress = current / total
-                                resume_progress.progress(progress)
-                                status_icon = "✅" if success else "❌"
-                                resume_status.markdown(
-                                    f"**Progress:** {current}/{total} | "
-                                    f"✅ Sent: {resume_counts['sent']} | ❌ Failed: {resume_counts['failed']} | "
-                                    f"Last: {status_icon} {email}"
-                                )
-
-                            cal_config = None
-                            if st.session_state.include_calendar_event:
-                                cal_config = {
-                                    'event_type': st.session_state.calendar_event_type,
-                                    'title': st.session_state.calendar_event_title,
-                                    'date_str': st.session_state.calendar_event_date.strftime('%Y-%m-%d') if st.session_state.calendar_event_date else '',
-                                    'start_time_str': st.session_state.calendar_event_start_time.strftime('%H:%M'),
-                                    'duration_str': st.session_state.calendar_event_duration or '1 hour',
-                                    'organizer_name': st.session_state.calendar_event_organizer_name or st.session_state.sender_name,
-                                    'organizer_email': st.session_state.calendar_event_organizer_email or st.session_state.sender_email,
-                                    'location': st.session_state.calendar_event_location,
-                                    'meeting_link': st.session_state.calendar_event_meeting_link,
-                                    'description': st.session_state.calendar_event_description,
-                                }
-
-                            try:
-                                results = resume_sender.send_bulk_emails(
-                                    students=students_to_email,
-                                    subject=st.session_state.email_subject,
-                                    html_template=st.session_state.email_template,
-                                    delay=float(Config.DELAY_BETWEEN_EMAILS),
-                                    progress_callback=resume_progress_callback,
-                                    calendar_event_config=cal_config,
-                                    checkpoint_interval=10,
-                                    resume_from_checkpoint=True,
-                                )
-                                st.session_state.email_results = results
-                                st.session_state.emails_sent = True
-                                st.success(f"✅ Resume complete! Sent: {resume_counts['sent']} | Failed: {resume_counts['failed']}")
-                                st.balloons()
-                            except Exception as e:
-                                st.error(f"⚠️ Crashed again: {str(e)}. Progress saved — you can resume again.")
+                st.button(
+                    "🔄 Resume Sending", type="primary",
+                    on_click=_resume_send, args=(students_to_email, resumable_session),
+                )
+                if 'resume_error' in st.session_state:
+                    st.error(st.session_state.pop('resume_error'))
 
             with resume_col2:
                 if st.button("🗑️ Discard & Start Fresh"):
@@ -1132,189 +1648,41 @@ with tab5:
         st.subheader("⚙️ Sending Settings")
         delay_between = st.slider(
             "Delay between emails (seconds)",
-            min_value=0.01,
+            min_value=0.0,
             max_value=10.0,
             value=float(Config.DELAY_BETWEEN_EMAILS),
             step=0.01,
-            help="Time to wait between sending each email (to avoid rate limits)"
-        )
-
-        # Preview recipients
-        with st.expander(f"👥 Preview Recipients ({len(students_to_email)})"):
-            if st.session_state.skip_link_generation:
-                preview_df = pd.DataFrame(students_to_email)[['name', 'email']]
-            else:
-                preview_df = pd.DataFrame(students_to_email)[['name', 'email', 'candidate_id', 'login_link']]
-            st.dataframe(preview_df, use_container_width=True)
-
-        st.markdown("---")
-
-        # ── Calendar Event Options ─────────────────────────────────────────────
-        st.subheader("📅 Calendar Event (Optional)")
-        st.markdown(
-            "Attach a calendar invite to each email so recipients can add the exam session "
-            "to their calendar. Supported formats: **Google Meet** and **Outlook / Microsoft Teams**."
+            help="Minimum time between the start of consecutive emails. "
+                 "0 sends as fast as your SES account's maximum send rate allows."
         )
-
-        include_event = st.checkbox(
-            "Include calendar event (attach .ics invite to each email)",
-            value=st.session_state.include_calendar_event,
+        if st.session_state.get('ses_max_send_rate'):
+            st.caption(f"📈 SES max send rate (auto-detected): {st.session_state.ses_max_send_rate:g} emails/sec")
+        parallel_sends = st.slider(
+            "Parallel sends",
+            min_value=1,
+            max_value=16,
+            value=Config.MAX_PARALLEL_SENDS,
+            key='parallel_sends',
+            help="Emails in flight at once. Sending never exceeds your SES account's maximum send rate."
         )
-        st.session_state.include_calendar_event = include_event
-
-        if include_event:
-            st.markdown("**Select event type:**")
-            event_type_choice = st.radio(
-                "Calendar Platform",
-                options=[CalendarEvent.EVENT_TYPE_GOOGLE, CalendarEvent.EVENT_TYPE_OUTLOOK],
-                format_func=CalendarEvent.get_event_type_label,
-                index=0 if st.session_state.calendar_event_type == CalendarEvent.EVENT_TYPE_GOOGLE else 1,
-                horizontal=True,
-                label_visibility="collapsed",
-            )
-            st.session_state.calendar_event_type = event_type_choice
-
-            st.markdown("**Event Details** *(fill in as plain text)*")
 
-            ev_col1, ev_col2 = st.columns(2)
-
-            with ev_col1:
-                ev_title = st.text_input(
-                    "Event Title *",
-                    value=st.session_state.calendar_event_title,
-                    placeholder="e.g. Software Engineering Exam",
-                    help="Title of the calendar event",
-                )
-                st.session_state.calendar_event_title = ev_title
-
-                ev_date = st.date_input(
-                    "Event Date *",
-                    value=st.session_state.calendar_event_date,
-                    format="YYYY-MM-DD",
-                    help="Select the date of the exam session",
-                )
-                st.session_state.calendar_event_date = ev_date
-
-                ev_start_time = st.time_input(
-                    "Start Time *",
-                    value=st.session_state.calendar_event_start_time,
-                    step=300,
-                    help="Select the start time (5-minute increments)",
-                )
-                st.session_state.calendar_event_start_time = ev_start_time
-
-                st.markdown(r"**Duration \*:**")
-                dur_col_h, dur_col_m = st.columns(2)
-                with dur_col_h:
-                    ev_dur_hours = st.number_input(
-                        "Hours",
-                        min_value=0,
-                        max_value=23,
-                        value=st.session_state.calendar_event_duration_hours,
-                        step=1,
-                    )
-                    st.session_state.calendar_event_duration_hours = ev_dur_hours
-                with dur_col_m:
-                    ev_dur_mins = st.number_input(
-                        "Minutes",
-                        min_value=0,
-                        max_value=55,
-                        value=st.session_state.calendar_event_duration_minutes,
-                        step=5,
-                    )
-                    st.session_state.calendar_event_duration_minutes = ev_dur_mins
-
-                # Compose duration string for the ICS generator
-                if ev_dur_hours > 0 and ev_dur_mins > 0:
-                    ev_duration = f"{ev_dur_hours}h {ev_dur_mins}m"
-                elif ev_dur_hours > 0:
-                    ev_duration = f"{ev_dur_hours}h"
-                elif ev_dur_mins > 0:
-                    ev_duration = f"{ev_dur_mins}m"
+        # Preview recipients
+        expander, expanded = _lazy_expander(f"👥 Preview Recipients ({len(students_to_email)})", 'exp_recipients')
+        if expanded:
+            with expander:
+                if st.session_state.skip_link_generation:
+                    preview_cols = ['name', 'email']
                 else:
-                    ev_duration = "1h"  # fallback
-                st.session_state.calendar_event_duration = ev_duration
-
-            with ev_col2:
-                ev_organizer_name = st.text_input(
-                    "Organizer Name",
-                    value=st.session_state.calendar_event_organizer_name or st.session_state.sender_name,
-                    placeholder="e.g. Exam Portal Team",
-                    help="Name of the event organizer (defaults to sender name)",
-                )
-                st.session_state.calendar_event_organizer_name = ev_organizer_name
-
-                ev_organizer_email = st.text_input(
-                    "Organizer Email",
-                    value=st.session_state.calendar_event_organizer_email or st.session_state.sender_email,
-                    placeholder="e.g. exams@yourcompany.com",
-                    help="Organizer's email address (defaults to sender email)",
+                    preview_cols = ['name', 'email', 'candidate_id', 'login_link']
+                _paged_dataframe(
+                    _df('students_to_email', students_to_email), 'page_recipients',
+                    column_order=preview_cols, use_container_width=True,
                 )
-                st.session_state.calendar_event_organizer_email = ev_organizer_email
-
-                ev_meeting_link = st.text_input(
-                    "Meeting Link",
-                    value=st.session_state.calendar_event_meeting_link,
-                    placeholder=(
-                        "e.g. https://meet.google.com/abc-xyz"
-                        if event_type_choice == CalendarEvent.EVENT_TYPE_GOOGLE
-                        else "e.g. https://teams.microsoft.com/..."
-                    ),
-                    help="Video conference URL (Google Meet or Teams link)",
-                )
-                st.session_state.calendar_event_meeting_link = ev_meeting_link
-
-                ev_location = st.text_input(
-                    "Physical Location (optional)",
-                    value=st.session_state.calendar_event_location,
-                    placeholder="e.g. Room 101, Main Building",
-                    help="Physical location or leave blank if online only",
-                )
-                st.session_state.calendar_event_location = ev_location
-
-            ev_description = st.text_area(
-                "Event Description (optional)",
-                value=st.session_state.calendar_event_description,
-                placeholder="e.g. Please join this session for your exam. Make sure you have a stable internet connection.",
-                height=80,
-                help="Additional instructions or notes for attendees",
-            )
-            st.session_state.calendar_event_description = ev_description
 
-            # Validate required fields and show preview
-            missing_event_fields = []
-            if not ev_title.strip():
-                missing_event_fields.append("Event Title")
-            if ev_date is None:
-                missing_event_fields.append("Event Date")
+        st.markdown("---")
 
-            if missing_event_fields:
-                st.warning(f"⚠️ Calendar event is missing: {', '.join(missing_event_fields)}")
-            else:
-                from modules.calendar_event import CalendarEvent as _CE
-                _sample_ics, _sample_err = _CE.generate_ics(
-                    event_type=event_type_choice,
-                    title=ev_title,
-                    date_str=ev_date.strftime('%Y-%m-%d'),
-                    start_time_str=ev_start_time.strftime('%H:%M'),
-                    duration_str=ev_duration or '1 hour',
-                    organizer_name=ev_organizer_name or st.session_state.sender_name,
-                    organizer_email=ev_organizer_email or st.session_state.sender_email,
-                    attendee_name='Sample Attendee',
-                    attendee_email='sample@example.com',
-                    location=ev_location,
-                    meeting_link=ev_meeting_link,
-                    description=ev_description,
-                )
-                if _sample_err:
-                    st.error(f"❌ Calendar event error: {_sample_err}")
-                else:
-                    platform_label = CalendarEvent.get_event_type_label(event_type_choice)
-                    st.success(
-                        f"✅ Calendar invite ready — **{platform_label}** event "
-                        f"**'{ev_title}'** on **{ev_date.strftime('%d %b %Y')}** at **{ev_start_time.strftime('%H:%M')}** "
-                        f"for **{ev_duration}**. Each recipient will receive a personalised .ics attachment."
-                    )
+        # ── Calendar Event Options ─────────────────────────────────────────────
+        _render_calendar_section()
 
         st.markdown("---")
 
@@ -1359,33 +1727,23 @@ with tab5:
         # internal reruns and closes it on the ✕ — so we must NOT re-open it from a
         # sticky session flag (that overlay would reappear on every rerun, even on
         # other tabs, e.g. after clicking Save in the Template tab).
-        if st.button("📨 Send All Emails", type="primary", disabled=not confirm):
+        if st.button("📨 Send All Emails", type="primary", disabled=not confirm or sending):
             _confirm_send_dialog()
 
         # The dialog's "Confirm & Send" sets do_send_emails and calls st.rerun(),
         # which closes the modal. We land here on that next run with the dialog
         # gone. Pause ~1s (inside a spinner so the closed state is painted) before
-        # kicking off the blocking send loop, so the modal is visibly dismissed
-        # first. (Don't chain extra st.rerun() calls — Streamlit batches chained
-        # reruns into a single frontend repaint, which would leave the overlay up
-        # until sending finished.)
-        if st.session_state.get('do_send_emails'):
+        # starting the send, so the modal is visibly dismissed first. (Don't chain
+        # extra st.rerun() calls — Streamlit batches chained reruns into a single
+        # frontend repaint.) The progress fragment below picks the job up this run.
+        if st.session_state.get('do_send_emails') and not sending:
             st.session_state.do_send_emails = False
             with st.spinner("Starting…"):
                 time.sleep(1)
             if not st.session_state.aws_access_key or not st.session_state.aws_secret_key:
                 st.error("❌ Please configure AWS SES credentials in Tab 1.")
             else:
-                ses_config = {
-                    'aws_access_key': st.session_state.aws_access_key,
-                    'aws_secret_key': st.session_state.aws_secret_key,
-                    'aws_region': st.session_state.aws_region,
-                    'sender_email': st.session_state.sender_email,
-                    'sender_name': st.session_state.sender_name,
-                    'configuration_set': Config.AWS_SES_CONFIGURATION_SET,
-                }
-
-                email_sender = EmailSender(ses_config)
+                email_sender = _get_email_sender(**_ses_config())
 
                 # Test connection first
                 with st.spinner("Testing AWS SES connection..."):
@@ -1396,111 +1754,27 @@ with tab5:
                 else:
                     st.success("✅ AWS SES connection verified!")
 
-                    # Progress tracking
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    results_container = st.container()
-
-                    counts = {'sent': 0, 'failed': 0}
-
-                    def progress_callback(current, total, email, success, message):
-                        if success:
-                            counts['sent'] += 1
-                        else:
-                            counts['failed'] += 1
-
-                        progress = current / total
-                        progress_bar.progress(progress)
-                        status_icon = "✅" if success else "❌"
-                        status_text.markdown(
-                            f"**Progress:** {current}/{total} | "
-                            f"✅ Sent: {counts['sent']} | ❌ Failed: {counts['failed']} | "
-                            f"Last: {status_icon} {email}"
-                        )
-
-                        # Save intermediate results to session state every 10 emails
-                        # so partial data survives Streamlit reruns
-                        if current % 10 == 0:
-                            st.session_state.email_results_partial = True
-
-                    # Override program_name if custom value is set
-                    if st.session_state.custom_program_name:
-                        for s in students_to_email:
-                            s['program_name'] = st.session_state.custom_program_name
-
-                    # Build calendar event config if enabled
-                    cal_config = None
-                    if st.session_state.include_calendar_event:
-                        cal_config = {
-                            'event_type': st.session_state.calendar_event_type,
-                            'title': st.session_state.calendar_event_title,
-                            'date_str': st.session_state.calendar_event_date.strftime('%Y-%m-%d') if st.session_state.calendar_event_date else '',
-                            'start_time_str': st.session_state.calendar_event_start_time.strftime('%H:%M'),
-                            'duration_str': st.session_state.calendar_event_duration or '1 hour',
-                            'organizer_name': st.session_state.calendar_event_organizer_name or st.session_state.sender_name,
-                            'organizer_email': st.session_state.calendar_event_organizer_email or st.session_state.sender_email,
-                            'location': st.session_state.calendar_event_location,
-                            'meeting_link': st.session_state.calendar_event_meeting_link,
-                            'description': st.session_state.calendar_event_description,
-                        }
-
-                    # Send emails with crash protection
-                    results = None
-                    try:
-                        results = email_sender.send_bulk_emails(
-                            students=students_to_email,
-                            subject=st.session_state.email_subject,
-                            html_template=st.session_state.email_template,
-                            delay=delay_between,
-                            progress_callback=progress_callback,
-                            calendar_event_config=cal_config,
-                            checkpoint_interval=10,
-                        )
-                    except Exception as e:
-                        st.error(
-                            f"⚠️ **Email sending crashed after {counts['sent'] + counts['failed']} emails!**\n\n"
-                            f"**Error:** {str(e)}\n\n"
-                            f"✅ Sent: {counts['sent']} | ❌ Failed: {counts['failed']} | "
-                            f"📭 Not sent: {len(students_to_email) - counts['sent'] - counts['failed']}\n\n"
-                            f"📁 A crash report has been auto-saved to the `reports/` folder.\n\n"
-                            f"🔄 **You can resume sending** from where it stopped — reload the app and use the Resume button."
-                        )
-                        # Load partial results from the checkpoint
-                        resumable = EmailSender.get_resumable_session()
-                        if resumable:
-                            checkpoint_data = EmailSender._load_latest_checkpoint()
-                            if checkpoint_data:
-                                results = checkpoint_data.get('results', [])
-
-                    if results:
-                        st.session_state.email_results = results
-                        st.session_state.emails_sent = True
-
-                    # Final summary
-                    st.markdown("---")
-                    st.subheader("📊 Sending Complete!")
-
-                    summary_col1, summary_col2, summary_col3 = st.columns(3)
-                    with summary_col1:
-                        st.metric("Total Emails", counts['sent'] + counts['failed'])
-                    with summary_col2:
-                        st.metric("Successfully Sent", counts['sent'])
-                    with summary_col3:
-                        st.metric("Failed", counts['failed'])
-
-                    if counts['failed'] > 0:
-                        st.warning("Some emails failed to send. Check the Reports tab for details.")
+                    _start_send_job(
+                        'send', email_sender, students_to_email, {'sent': 0, 'failed': 0},
+                        subject=st.session_state.email_subject,
+                        html_template=st.session_state.email_template,
+                        delay=delay_between,
+                        calendar_event_config=_calendar_config(),
+                        checkpoint_interval=10,
+                        max_workers=parallel_sends,
+                        max_retries=Config.MAX_RETRIES,
+                    )
 
-                    if results and len(results) == len(students_to_email):
-                        st.balloons()
+        _render_send_job('send')
 
         # Show previous results if available
         if st.session_state.emails_sent and st.session_state.email_results:
             st.markdown("---")
             st.subheader("📋 Previous Send Results")
-            results_df = pd.DataFrame(st.session_state.email_results)
-            st.dataframe(
-                results_df[['name', 'email', 'email_status', 'email_message', 'send_time']],
+            results_df = _df('email_results', st.session_state.email_results)
+            _paged_dataframe(
+                results_df, 'page_previous_results',
+                column_order=['name', 'email', 'email_status', 'email_message', 'send_time'],
                 use_container_width=True
             )
 
@@ -1518,21 +1792,21 @@ with tab6:
         if st.session_state.students_with_links:
             st.subheader("🔗 Generated Links Report")
 
-            links_df = pd.DataFrame(st.session_state.students_with_links)
+            links_df = _df('students_with_links', st.session_state.students_with_links)
+
+            no_link = int((links_df['login_link'] == 'N/A').sum())
 
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric("Total Students", len(links_df))
             with col2:
-                has_link = len(links_df[links_df['login_link'] != 'N/A'])
-                st.metric("Links Generated", has_link)
+                st.metric("Links Generated", len(links_df) - no_link)
             with col3:
-                no_link = len(links_df[links_df['login_link'] == 'N/A'])
                 st.metric("Missing Links", no_link)
 
-            st.dataframe(links_df, use_container_width=True, height=300)
+            _paged_dataframe(links_df, 'page_links_report', use_container_width=True, height=300)
 
-            csv_links = links_df.to_csv(index=False)
+            csv_links = partial(_rows_to_csv, st.session_state.students_with_links)
             st.download_button(
                 label="📥 Download Links Report (CSV)",
                 data=csv_links,
@@ -1546,13 +1820,14 @@ with tab6:
             st.markdown("---")
             st.subheader("📧 Email Sending Report")
 
-            results_df = pd.DataFrame(st.session_state.email_results)
+            results_df = _df('email_results', st.session_state.email_results)
 
             # Summary metrics
             total = len(results_df)
-            sent = len(results_df[results_df['email_status'] == 'sent'])
-            failed = len(results_df[results_df['email_status'] == 'failed'])
-            pending = len(results_df[results_df['email_status'] == 'pending'])
+            status_counts = results_df['email_status'].value_counts()
+            sent = int(status_counts.get('sent', 0))
+            failed = int(status_counts.get('failed', 0))
+            pending = int(status_counts.get('pending', 0))
 
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -1567,14 +1842,16 @@ with tab6:
 
             # Status chart
             if total > 0:
-                status_counts = results_df['email_status'].value_counts()
                 st.bar_chart(status_counts)
 
             # Detailed results
             st.subheader("📋 Detailed Results")
             display_cols = ['name', 'email', 'candidate_id', 'email_status', 'email_message', 'send_time']
             available_cols = [c for c in display_cols if c in results_df.columns]
-            st.dataframe(results_df[available_cols], use_container_width=True, height=400)
+            _paged_dataframe(
+                results_df, 'page_detailed_results',
+                column_order=available_cols, use_container_width=True, height=400,
+            )
 
             # Filter by status
             status_filter = st.selectbox(
@@ -1583,10 +1860,13 @@ with tab6:
             )
             if status_filter != 'All':
                 filtered_df = results_df[results_df['email_status'] == status_filter]
-                st.dataframe(filtered_df[available_cols], use_container_width=True)
+                _paged_dataframe(
+                    filtered_df, 'page_filtered_results',
+                    column_order=available_cols, use_container_width=True,
+                )
 
             # Download
-            csv_results = results_df.to_csv(index=False)
+            csv_results = partial(_rows_to_csv, st.session_state.email_results)
             st.download_button(
                 label="📥 Download Email Report (CSV)",
                 data=csv_results,
@@ -1605,7 +1885,7 @@ with tab6:
                     use_container_width=True
                 )
 
-                failed_csv = failed_df.to_csv(index=False)
+                failed_csv = partial(_failed_rows_to_csv, st.session_state.email_results)
                 st.download_button(
                     label="📥 Download Failed Emails (CSV)",
                     data=failed_csv,
@@ -1619,15 +1899,9 @@ with tab6:
     st.subheader("💾 Saved Reports on Disk")
     reports_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reports')
     if os.path.exists(reports_dir):
-        report_files = sorted(
-            [f for f in os.listdir(reports_dir) if f.endswith('.csv') or f.endswith('.txt')],
-            reverse=True
-        )
-        crash_reports = [f for f in report_files if f.lower().startswith('crash')]
-        normal_reports = [f for f in report_files if not f.lower().startswith('crash') and not f.startswith('checkpoint_')]
+        crash_reports, normal_reports = _list_reports(reports_dir, os.stat(reports_dir).st_mtime)
 
         # Keep only the latest 3 auto-saved reports; delete older ones from disk.
-        normal_reports.sort(key=lambda f: os.path.getmtime(os.path.join(reports_dir, f)), reverse=True)
         for stale in normal_reports[3:]:
             try:
                 os.remove(os.path.join(reports_dir, stale))
@@ -1649,11 +1923,12 @@ with tab6:
                             pass
                     # Also clean up checkpoint files
                     for fname in os.listdir(reports_dir):
-                        if fname.startswith('checkpoint_') and fname.endswith('.json'):
+                        if fname.startswith('checkpoint_') and fname.endswith(('.json', '.jsonl')):
                             try:
                                 os.remove(os.path.join(reports_dir, fname))
                             except Exception:
                                 pass
+                    _list_reports.clear()
                     st.success("✅ All reports deleted.")
                     st.rerun()
 
@@ -1661,15 +1936,13 @@ with tab6:
             st.warning(f"⚠️ **{len(crash_reports)} crash report(s) found:**")
             for fname in crash_reports:
                 fpath = os.path.join(reports_dir, fname)
-                with open(fpath, 'r', encoding='utf-8') as rf:
-                    file_data = rf.read()
                 col_a, col_b, col_c = st.columns([3, 1, 1])
                 with col_a:
                     st.text(f"📄 {fname}")
                 with col_b:
                     st.download_button(
                         label="📥 Download",
-                        data=file_data,
+                        data=_file_reader(fpath),
                         file_name=fname,
                         mime="text/csv" if fname.endswith('.csv') else "text/plain",
                         key=f"download_report_{fname}"
@@ -1678,6 +1951,7 @@ with tab6:
                     if st.button("🗑️ Delete", key=f"delete_report_{fname}"):
                         try:
                             os.remove(fpath)
+                            _list_reports.clear()
                             st.success(f"Deleted {fname}")
                             st.rerun()
                         except Exception as e:
@@ -1687,15 +1961,13 @@ with tab6:
             st.info(f"📁 **{len(normal_reports)} auto-saved report(s):**")
             for fname in normal_reports:
                 fpath = os.path.join(reports_dir, fname)
-                with open(fpath, 'r', encoding='utf-8') as rf:
-                    file_data = rf.read()
                 col_a, col_b, col_c = st.columns([3, 1, 1])
                 with col_a:
                     st.text(f"📄 {fname}")
                 with col_b:
                     st.download_button(
                         label="📥 Download",
-                        data=file_data,
+                        data=_file_reader(fpath),
                         file_name=fname,
                         mime="text/csv",
                         key=f"download_report_{fname}"
@@ -1704,6 +1976,7 @@ with tab6:
                     if st.button("🗑️ Delete", key=f"delete_report_{fname}"):
                         try:
                             os.remove(fpath)
+                            _list_reports.clear()
                             st.success(f"Deleted {fname}")
                             st.rerun()
                         except Exception as e:
@@ -1718,7 +1991,10 @@ with tab6:
 # ═══════════════════════════════════════════════════════════════════════════════
 # TAB 7: Email Tracking (CloudWatch Metrics)
 # ═══════════════════════════════════════════════════════════════════════════════
-with tab7:
+# A fragment, so the time-range picker and Refresh rerun only this tab. Fetched
+# metrics are kept per session; other tabs' reruns never go back to CloudWatch.
+@st.fragment
+def _render_tracking_tab():
     st.header("Email Tracking Dashboard")
 
     if not Config.AWS_SES_CONFIGURATION_SET:
@@ -1757,17 +2033,24 @@ with tab7:
         if st.button("Refresh Metrics", type="primary"):
             st.session_state.pop('_tracking_cache', None)
 
-        # Fetch metrics
+        # Fetch metrics (reused until the range/credentials change or Refresh is pressed)
+        cache_key = (hours, period, st.session_state.aws_access_key, st.session_state.aws_region)
+        cached = st.session_state.get('_tracking_cache')
         try:
-            tracker = EmailTracker(
-                aws_access_key=st.session_state.aws_access_key,
-                aws_secret_key=st.session_state.aws_secret_key,
-                aws_region=st.session_state.aws_region,
-                configuration_set=Config.AWS_SES_CONFIGURATION_SET,
-            )
+            if cached and cached['key'] == cache_key:
+                metrics = cached['metrics']
+            else:
+                tracker = _get_email_tracker(
+                    st.session_state.aws_access_key,
+                    st.session_state.aws_secret_key,
+                    st.session_state.aws_region,
+                    Config.AWS_SES_CONFIGURATION_SET,
+                )
 
-            with st.spinner("Fetching metrics from CloudWatch..."):
-                metrics = tracker.get_all_metrics(hours=hours, period=period)
+                with st.spinner("Fetching metrics from CloudWatch..."):
+                    metrics = tracker.get_all_metrics(hours=hours, period=period)
+                if not metrics.get('error'):
+                    st.session_state['_tracking_cache'] = {'key': cache_key, 'metrics': metrics}
 
             if metrics.get('error'):
                 st.error(f"Error fetching metrics: {metrics['error']}")
@@ -1847,6 +2130,10 @@ with tab7:
             st.error(f"Failed to connect to CloudWatch: {str(e)}")
 
 
+with tab7:
+    _render_tracking_tab()
+
+
 # ─── Sidebar ─────────────────────────────────────────────────────────────────
 with st.sidebar:
     st.markdown("## 📧 Exam Email Sender")
@@ -1858,8 +2145,9 @@ with st.sidebar:
     st.markdown(f"- **Emails Sent:** {'✅' if st.session_state.emails_sent else '❌'}")
 
     if st.session_state.email_results:
-        sent = len([r for r in st.session_state.email_results if r['email_status'] == 'sent'])
-        failed = len([r for r in st.session_state.email_results if r['email_status'] == 'failed'])
+        status_counts = _session_memo('status_counts', st.session_state.email_results, _status_counts)
+        sent = status_counts.get('sent', 0)
+        failed = status_counts.get('failed', 0)
         st.markdown(f"- **Sent:** {sent} ✅")
         st.markdown(f"- **Failed:** {failed} ❌")
 
@@ -1892,4 +2180,5 @@ with st.sidebar:
                     st.session_state[key] = []
                 elif isinstance(st.session_state[key], bool):
                     st.session_state[key] = False
+        st.session_state.upload_key = None
         st.rerun()
@@ -6,14 +6,22 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-def _get_config(key: str, default: str = '') -> str:
-    """Get config value from Streamlit secrets (Cloud) or environment variables (local)."""
+def _load_secrets() -> dict:
+    """Streamlit secrets as a plain dict, read once (empty when there is no secrets file)."""
     try:
         import streamlit as st
-        if key in st.secrets:
-            return str(st.secrets[key])
+        return dict(st.secrets)
     except Exception:
-        pass
+        return {}
+
+
+_SECRETS = _load_secrets()
+
+
+def _get_config(key: str, default: str = '') -> str:
+    """Get config value from Streamlit secrets (Cloud) or environment variables (local)."""
+    if key in _SECRETS:
+        return str(_SECRETS[key])
     return os.getenv(key, default)
 
 
@@ -40,3 +48,4 @@ class Config:
     DELAY_BETWEEN_EMAILS = 0.01
     BATCH_SIZE = 50
     MAX_RETRIES = 3
+    MAX_PARALLEL_SENDS = 8
@@ -1,8 +1,17 @@
 """API client for generating exam portal links"""
 
+import json
+import re
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timezone
 from typing import List, Dict, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+# Runs of slashes inside a URL path
+_DOUBLE_SLASH = re.compile(r'//+')
 
 
 class APIClient:
@@ -24,6 +33,27 @@ class APIClient:
         self.api_key = api_key
         self.timeout = timeout
 
+        # One pooled session per client so repeated calls reuse the TCP/TLS connection.
+        # Only connection failures are retried: a POST that reached the server may
+        # already have generated links.
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        })
+        if api_key:
+            self._session.headers["x-api-key"] = api_key
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5),
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+    def close(self):
+        self._session.close()
+
     def generate_links(
         self,
         emails: List[str],
@@ -52,18 +82,11 @@ class APIClient:
         }
 
         try:
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            }
-            if self.api_key:
-                headers["x-api-key"] = self.api_key
-
-            response = requests.post(
+            # Compact separators: the email list is most of the body
+            response = self._session.post(
                 self.api_endpoint,
-                json=payload,
-                timeout=self.timeout,
-                headers=headers
+                data=json.dumps(payload, separators=(',', ':')).encode('utf-8'),
+                timeout=self.timeout
             )
 
             if response.status_code != 200:
@@ -93,6 +116,63 @@ class APIClient:
         except Exception as e:
             return False, {}, f"Unexpected error: {str(e)}"
 
+    def generate_links_batched(
+        self,
+        emails: List[str],
+        program_id: int,
+        round_id: int,
+        session_time: str,
+        batch_size: int = 50,
+        max_workers: int = 8
+    ) -> Tuple[bool, Dict, str]:
+        """
+        Call generate_links in batch_size chunks, several at a time.
+
+        The per-chunk responses are merged into a single response that
+        map_links_to_students accepts. Emails in a chunk that failed are
+        reported as errors with that chunk's message, so one bad batch does
+        not lose the others.
+
+        Returns: (success, response_data, error_message) - success is False
+        only when every chunk failed.
+        """
+        chunks = [emails[i:i + batch_size] for i in range(0, len(emails), batch_size)]
+        if len(chunks) <= 1:
+            return self.generate_links(emails, program_id, round_id, session_time)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as ex:
+            outcomes = list(ex.map(
+                lambda chunk: self.generate_links(chunk, program_id, round_id, session_time),
+                chunks
+            ))
+
+        generated_links = []
+        errors = []
+        program_info = None
+        first_error = ""
+        for chunk, (success, data, error_msg) in zip(chunks, outcomes):
+            if not success:
+                first_error = first_error or error_msg
+                errors.extend({'email': email, 'error': error_msg} for email in chunk)
+                continue
+            response_data = data['data']
+            generated_links.extend(response_data.get('generated_links', []))
+            errors.extend(response_data.get('errors', []))
+            if program_info is None:
+                program_info = response_data.get('program_info', {})
+
+        if program_info is None:
+            return False, {}, first_error
+
+        return True, {
+            'status': 'ok',
+            'data': {
+                'generated_links': generated_links,
+                'program_info': program_info,
+                'errors': errors,
+            },
+        }, ""
+
     @staticmethod
     def map_links_to_students(students: List[Dict], api_response: Dict) -> Tuple[List[Dict], List[Dict]]:
         """
@@ -111,13 +191,11 @@ class APIClient:
         program_name = program_info.get('program_name', 'N/A')
         round_name = program_info.get('round_name', 'N/A')
 
-        # Build a set of failed emails from API errors
-        failed_emails = set()
+        # Build a lookup of failed emails from API errors
         error_lookup = {}
         for err in api_errors:
             err_email = err.get('email', '').strip().lower()
             if err_email:
-                failed_emails.add(err_email)
                 error_lookup[err_email] = err.get('error', 'Unknown error')
 
         # Build a lookup by email for generated links
@@ -127,6 +205,7 @@ class APIClient:
             if email_key:
                 link_lookup[email_key] = link_entry
 
+        format_expires_at = APIClient._format_expires_at
         successful_students = []
         failed_candidates = []
 
@@ -134,15 +213,15 @@ class APIClient:
             email = student['email'].strip().lower()
 
             # Check if this email failed in the API
-            if email in failed_emails:
+            if email in error_lookup:
                 failed_candidates.append({
                     'name': student['name'],
                     'email': student['email'],
-                    'error': error_lookup.get(email, 'Candidate not found'),
+                    'error': error_lookup[email],
                 })
                 continue
 
-            link_data = link_lookup.get(email, {})
+            link_data = link_lookup.get(email)
 
             # If no link data found and not in errors, still mark as failed
             if not link_data:
@@ -153,26 +232,24 @@ class APIClient:
                 })
                 continue
 
-            # Fix double-slash in login_link URL
+            # Fix double-slash in the login_link path (query and fragment may carry encoded URLs)
             login_link = link_data.get('login_link', link_data.get('link', 'N/A'))
             if isinstance(login_link, str) and '://' in login_link:
-                parts = login_link.split('://', 1)
-                if len(parts) == 2:
-                    parts[1] = parts[1].replace('//', '/')
-                    login_link = '://'.join(parts)
+                parts = urlsplit(login_link)
+                if '//' in parts.path:
+                    login_link = urlunsplit(parts._replace(path=_DOUBLE_SLASH.sub('/', parts.path)))
 
-            enriched_student = {
+            successful_students.append({
                 'name': student['name'],
                 'email': student['email'],
                 'candidate_id': link_data.get('candidate_id', 'N/A'),
                 'login_link': login_link,
-                'expires_at': APIClient._format_expires_at(link_data.get('expires_at', 'N/A')),
+                'expires_at': format_expires_at(link_data.get('expires_at', 'N/A')),
                 'program_name': program_name,
                 'round_name': round_name,
                 'login_id': student.get('login_id', ''),
                 'password': student.get('password', ''),
                 'email_status': 'pending',
-            }
-            successful_students.append(enriched_student)
+            })
 
         return successful_students, failed_candidates
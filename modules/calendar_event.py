@@ -2,9 +2,16 @@
 
 import re
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+_HOURS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*h(?:our|ours|r|rs)?')
+_MINS_RE = re.compile(r'(\d+)\s*m(?:in|ins|inute|inutes)?')
+_PLAIN_RE = re.compile(r'^(\d+)$')
+
+# Backslash, semicolon and comma escapes for _escape_value, applied in one pass
+_ICS_ESCAPES = str.maketrans({'\\': '\\\\', ';': '\\;', ',': '\\,'})
+
 
 class CalendarEvent:
     """Generates ICS calendar event data compatible with Google Calendar and Outlook."""
@@ -12,6 +19,16 @@ class CalendarEvent:
     EVENT_TYPE_GOOGLE = "google_meet"
     EVENT_TYPE_OUTLOOK = "outlook"
 
+    # Static calendar header; every line is well under 75 octets, so no folding needed
+    _HEADER = (
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "PRODID:-//Exam Portal Email Sender//EN\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        "METHOD:REQUEST\r\n"
+        "BEGIN:VEVENT\r\n"
+    )
+
     @staticmethod
     def _parse_datetime(date_str: str, time_str: str) -> Optional[datetime]:
         """
@@ -67,26 +84,27 @@ class CalendarEvent:
         """
         # Work in bytes to respect octet limit
         encoded = line.encode('utf-8')
-        if len(encoded) <= 75:
+        n = len(encoded)
+        if n <= 75:
             return line
-        result = b''
-        # First chunk: 75 bytes
-        result += encoded[:75] + b'\r\n '
-        remaining = encoded[75:]
-        # Subsequent chunks: 74 bytes each (1 byte used by the leading space)
-        while len(remaining) > 74:
-            result += remaining[:74] + b'\r\n '
-            remaining = remaining[74:]
-        result += remaining
-        return result.decode('utf-8')
+        # First chunk: 75 bytes; subsequent chunks: 74 bytes each (1 byte used by the
+        # leading space). A cut never lands inside a multi-byte UTF-8 character.
+        out = bytearray()
+        start, limit = 0, 75
+        while n - start > limit:
+            end = start + limit
+            while encoded[end] & 0xC0 == 0x80:
+                end -= 1
+            out += encoded[start:end]
+            out += b'\r\n '
+            start, limit = end, 74
+        out += encoded[start:]
+        return out.decode('utf-8')
 
     @staticmethod
     def _escape_value(value: str) -> str:
         """Escape special characters in ICS property values per RFC 5545."""
-        # Escape backslash first, then semicolons, commas, and newlines
-        value = value.replace('\\', '\\\\')
-        value = value.replace(';', '\\;')
-        value = value.replace(',', '\\,')
+        value = value.translate(_ICS_ESCAPES)
         # Literal newlines become \n escape sequence
         value = value.replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n')
         return value
@@ -101,8 +119,8 @@ class CalendarEvent:
         total_minutes = 0
 
         # Handle '1h 30m' or '1h30m' patterns
-        hours_match = re.search(r'(\d+(?:\.\d+)?)\s*h(?:our|ours|r|rs)?', duration_str)
-        mins_match = re.search(r'(\d+)\s*m(?:in|ins|inute|inutes)?', duration_str)
+        hours_match = _HOURS_RE.search(duration_str)
+        mins_match = _MINS_RE.search(duration_str)
 
         if hours_match:
             total_minutes += int(float(hours_match.group(1)) * 60)
@@ -111,7 +129,7 @@ class CalendarEvent:
 
         # Fallback: try plain number (assume minutes)
         if total_minutes == 0:
-            plain_match = re.search(r'^(\d+)$', duration_str.strip())
+            plain_match = _PLAIN_RE.search(duration_str.strip())
             if plain_match:
                 total_minutes = int(plain_match.group(1))
 
@@ -122,6 +140,13 @@ class CalendarEvent:
         """Format datetime to ICS format (local, no timezone suffix)."""
         return dt.strftime('%Y%m%dT%H%M%S')
 
+    @staticmethod
+    def _cn(name: str) -> str:
+        """Quote the CN parameter if it contains special characters."""
+        if any(c in name for c in (',', ';', ':', '"')):
+            return f'"{name}"'
+        return name
+
     @classmethod
     def generate_ics(
         cls,
@@ -144,6 +169,43 @@ class CalendarEvent:
         Returns:
             (ics_content: str, error: str | None)
         """
+        template, error = cls.prebuild_template(
+            event_type=event_type,
+            title=title,
+            date_str=date_str,
+            start_time_str=start_time_str,
+            duration_str=duration_str,
+            organizer_name=organizer_name,
+            organizer_email=organizer_email,
+            location=location,
+            meeting_link=meeting_link,
+            description=description,
+        )
+        if error:
+            return None, error
+        return cls.render_ics(template, attendee_name, attendee_email), None
+
+    @classmethod
+    def prebuild_template(
+        cls,
+        event_type: str,
+        title: str,
+        date_str: str,
+        start_time_str: str,
+        duration_str: str,
+        organizer_name: str,
+        organizer_email: str,
+        location: str = '',
+        meeting_link: str = '',
+        description: str = '',
+    ) -> tuple:
+        """
+        Build the attendee-independent parts of an event once, already folded.
+        Pass the result to `render_ics` for each attendee.
+
+        Returns:
+            (template: tuple | None, error: str | None)
+        """
         start_dt = cls._parse_datetime(date_str, start_time_str)
         if start_dt is None:
             return None, f"Could not parse date '{date_str}' or time '{start_time_str}'. Use format: YYYY-MM-DD and HH:MM"
@@ -151,9 +213,8 @@ class CalendarEvent:
         duration_mins = cls._parse_duration_minutes(duration_str)
         end_dt = start_dt + timedelta(minutes=duration_mins)
 
-        uid = str(uuid.uuid4())
         # DTSTAMP must be UTC (RFC 5545)
-        dtstamp_str = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+        dtstamp_str = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
         start_str = cls._format_dt(start_dt)
         end_str = cls._format_dt(end_dt)
 
@@ -167,53 +228,56 @@ class CalendarEvent:
 
         full_location = location or meeting_link or ''
 
-        # Quote the CN parameter if it contains special characters
-        def _cn(name: str) -> str:
-            if any(c in name for c in (',', ';', ':', '"')):
-                return f'"{name}"'
-            return name
-
-        # Build raw property lines (will be folded below)
-        raw_lines = [
-            "BEGIN:VCALENDAR",
-            "VERSION:2.0",
-            "PRODID:-//Exam Portal Email Sender//EN",
-            "CALSCALE:GREGORIAN",
-            "METHOD:REQUEST",
-            "BEGIN:VEVENT",
-            f"UID:{uid}",
+        # Raw property lines around the per-attendee UID and ATTENDEE lines
+        middle = [
             f"DTSTAMP:{dtstamp_str}",
             f"DTSTART:{start_str}",
             f"DTEND:{end_str}",
             f"SUMMARY:{cls._escape_value(title)}",
             f"DESCRIPTION:{full_description}",
             f"LOCATION:{cls._escape_value(full_location)}",
-            f"ORGANIZER;CN={_cn(organizer_name)}:MAILTO:{organizer_email}",
-            f"ATTENDEE;CN={_cn(attendee_name)};ROLE=REQ-PARTICIPANT;RSVP=TRUE:MAILTO:{attendee_email}",
+            f"ORGANIZER;CN={cls._cn(organizer_name)}:MAILTO:{organizer_email}",
+        ]
+        tail = [
             "STATUS:CONFIRMED",
             "SEQUENCE:0",
             "TRANSP:OPAQUE",
         ]
 
         if event_type == cls.EVENT_TYPE_GOOGLE and meeting_link:
-            raw_lines.append(f"X-GOOGLE-CONFERENCE:{meeting_link}")
+            tail.append(f"X-GOOGLE-CONFERENCE:{meeting_link}")
 
         if event_type == cls.EVENT_TYPE_OUTLOOK:
-            raw_lines += [
+            tail += [
                 "X-MICROSOFT-CDO-BUSYSTATUS:BUSY",
                 "X-MICROSOFT-CDO-IMPORTANCE:1",
                 "X-MS-OLK-ALLOWEXTERNCHECK:TRUE",
             ]
 
-        raw_lines += [
+        tail += [
             "END:VEVENT",
             "END:VCALENDAR",
         ]
 
         # Fold each line per RFC 5545 and join with CRLF
-        folded_lines = [cls._fold_line(line) for line in raw_lines]
-        ics_content = "\r\n".join(folded_lines) + "\r\n"
-        return ics_content, None
+        def _block(lines: list) -> str:
+            return "".join(cls._fold_line(line) + "\r\n" for line in lines)
+
+        return (cls._HEADER, _block(middle), _block(tail)), None
+
+    @classmethod
+    def render_ics(cls, template: tuple, attendee_name: str, attendee_email: str) -> str:
+        """Fill a `prebuild_template` result for one attendee (each invite gets a fresh UID)."""
+        head, middle, tail = template
+        return "".join((
+            head,
+            f"UID:{uuid.uuid4()}\r\n",  # 40 octets, never folded
+            middle,
+            cls._fold_line(
+                f"ATTENDEE;CN={cls._cn(attendee_name)};ROLE=REQ-PARTICIPANT;RSVP=TRUE:MAILTO:{attendee_email}"
+            ), "\r\n",
+            tail,
+        ))
 
     @classmethod
     def get_event_type_label(cls, event_type: str) -> str:
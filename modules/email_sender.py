@@ -1,23 +1,218 @@
 """Email sender module for sending personalized emails via AWS SES"""
 
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError, NoCredentialsError
 from typing import Dict, List, Tuple, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import html as html_lib
+import queue
+import random
+import threading
 import time
 import re
+import uuid
 import json
+import logging
 import os
 import csv
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from email.header import Header
+from email.utils import formataddr
+
+from modules.template_manager import split_placeholders
+
+# Placeholders filled per recipient; one alternation regex substitutes them all in a single pass
+_PLACEHOLDERS = (
+    'name', 'email', 'login_link', 'candidate_id', 'program_name', 'round_name',
+    'expires_at', 'session_duration', 'login_id', 'password',
+)
+_PLACEHOLDER_RE = re.compile(r'\{(' + '|'.join(_PLACEHOLDERS) + r')\}')
+
+# SendBulkTemplatedEmail accepts at most 50 destinations per call
+_BULK_BATCH_SIZE = 50
+
+# Fixed MIME boundaries for raw (calendar) emails. Every part is base64-encoded, and '=_'
+# never occurs inside base64 lines, so no per-message boundary check is needed.
+_MIME_BOUNDARY = f"=_exam-sender-{uuid.uuid4().hex}"
+
+
+def _mime_header(value: str) -> str:
+    """Header value on one line, RFC 2047-encoded when it isn't plain ASCII."""
+    value = ' '.join(value.splitlines())
+    return value if value.isascii() else Header(value, 'utf-8').encode()
+
+
+def _b64_body(text: str) -> str:
+    return base64.encodebytes(text.encode('utf-8')).decode('ascii')
+
+
+def _render_calendar_mime(
+    source: str,
+    recipient: str,
+    subject: str,
+    configuration_set: str,
+    plain_text: str,
+    html_body: str,
+    ics_content: str,
+    ics_filename: str,
+) -> str:
+    """
+    Raw multipart/mixed message: a text/html alternative plus the ICS attachment.
+
+    Writes the same structure email.mime would, without building and serializing a
+    MIME object tree for every recipient.
+    """
+    mixed, alt = _MIME_BOUNDARY + '-mixed', _MIME_BOUNDARY + '-alt'
+    headers = [
+        f'Content-Type: multipart/mixed; boundary="{mixed}"',
+        'MIME-Version: 1.0',
+        f'Subject: {_mime_header(subject)}',
+        f'From: {source}',
+        f'To: {recipient}',
+    ]
+    if configuration_set:
+        headers.append(f'X-SES-CONFIGURATION-SET: {configuration_set}')
+    return (
+        '\n'.join(headers) + '\n\n'
+        f'--{mixed}\n'
+        f'Content-Type: multipart/alternative; boundary="{alt}"\n'
+        'MIME-Version: 1.0\n\n'
+        f'--{alt}\n'
+        'Content-Type: text/plain; charset="utf-8"\n'
+        'MIME-Version: 1.0\n'
+        'Content-Transfer-Encoding: base64\n\n'
+        f'{_b64_body(plain_text)}\n'
+        f'--{alt}\n'
+        'Content-Type: text/html; charset="utf-8"\n'
+        'MIME-Version: 1.0\n'
+        'Content-Transfer-Encoding: base64\n\n'
+        f'{_b64_body(html_body)}\n'
+        f'--{alt}--\n\n'
+        f'--{mixed}\n'
+        'Content-Type: text/calendar; charset="utf-8"; method="REQUEST"\n'
+        'MIME-Version: 1.0\n'
+        'Content-Transfer-Encoding: base64\n'
+        f'Content-Disposition: attachment; filename="{ics_filename}"\n\n'
+        f'{_b64_body(ics_content)}\n'
+        f'--{mixed}--\n'
+    )
+
+# SES error codes worth retrying: throttling (454) and transient service-side failures.
+# Anything else (MessageRejected, unverified domain, bad address) fails immediately.
+_RETRYABLE_ERRORS = ('Throttling', 'ThrottlingException', 'ServiceUnavailable', 'RequestExpired')
+# The throttling subset, which also slows the shared token bucket down
+_THROTTLING_ERRORS = _RETRYABLE_ERRORS[:2]
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff capped at 30s, jittered so parallel workers don't retry in lockstep."""
+    return min(2 ** attempt, 30) * random.uniform(0.5, 1.0)
+
+
+# Tag stripping and whitespace collapsing for the plain-text alternative part; <head>,
+# <style> and <script> blocks are dropped whole so CSS doesn't end up in the text
+_NON_TEXT_RE = re.compile(r'<(head|style|script)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+logger = logging.getLogger(__name__)
 
 # Directory for checkpoints and crash reports
 CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'reports')
 
+# The Send tab asks for the resumable session on every rerun, so both lookups are cached:
+# checkpoint path -> ((next_index, log mtime, log size), (sent, failed))
+_RESULT_COUNTS_CACHE: Dict[str, tuple] = {}
+# checkpoint dir -> (dir mtime, header or None, header mtime). Headers are only ever
+# written via os.replace, which bumps the directory's mtime.
+_RESUMABLE_CACHE: Dict[str, tuple] = {}
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: refills at `rate` tokens/second, holds at most `capacity`.
+
+    `throttled()` halves the rate when SES pushes back (other senders may share the
+    account's quota); it then climbs back to the configured rate over ~10 seconds.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.base_rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._throttled_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def acquire(self, n: int = 1):
+        """Block until `n` tokens are available, then take them."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + elapsed * self.base_rate / 10)
+            self._updated = now
+            # Reserve the tokens now (possibly going negative) so waiters queue up fairly
+            self._tokens -= n
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+    def throttled(self):
+        with self._lock:
+            # Requests in flight together get throttled together: count that as one signal
+            now = time.monotonic()
+            if now - self._throttled_at >= 1.0:
+                self._throttled_at = now
+                self.rate = max(self.base_rate / 16, self.rate / 2)
+
+
+class _CheckpointWriter:
+    """
+    Appends results to the log and saves checkpoint headers on a background thread, in
+    submission order, so the send loop never waits on fsync. `close()` drains the queue;
+    call it before writing anything to the checkpoint directly.
+    """
+
+    def __init__(self, checkpoint_file: str):
+        self.checkpoint_file = checkpoint_file
+        self._queue = queue.Queue(maxsize=64)
+        self._thread = threading.Thread(target=self._run, name='checkpoint-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            rows, header = item
+            # Rows first: a header never points past results that aren't on disk yet
+            EmailSender._append_results_log(self.checkpoint_file, rows)
+            EmailSender._save_checkpoint(self.checkpoint_file, header)
+
+    def submit(self, rows: List[Dict], header: Dict):
+        self._queue.put((rows, header))
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
 
 class EmailSender:
 
+    # (monotonic time, get_send_quota response). test_connection and get_max_send_rate run
+    # back to back before every send, so one response serves both.
+    _quota: Optional[tuple] = None
+    _QUOTA_TTL = 30.0
+
     def __init__(self, ses_config: Dict):
         """
         ses_config should contain:
@@ -31,17 +226,27 @@ class EmailSender:
         self.sender_name = ses_config.get('sender_name', 'Exam Portal')
         self.configuration_set = ses_config.get('configuration_set', '')
 
+        # Source/From value, built once. formataddr quotes or RFC 2047-encodes the display
+        # name when needed; a non-ASCII address is left for SES to reject at send time.
+        try:
+            self._source = formataddr((self.sender_name, self.sender_email))
+        except UnicodeEncodeError:
+            self._source = f"{self.sender_name} <{self.sender_email}>"
+
+        # One client per sender, shared by all send threads. Size its connection pool
+        # above the largest worker count so parallel sends reuse kept-alive TLS connections.
         self.client = boto3.client(
             'ses',
             aws_access_key_id=self.aws_access_key,
             aws_secret_access_key=self.aws_secret_key,
-            region_name=self.aws_region
+            region_name=self.aws_region,
+            config=BotoConfig(max_pool_connections=32, tcp_keepalive=True),
         )
 
     def test_connection(self) -> Tuple[bool, str]:
         """Test AWS SES connection by verifying the sender identity"""
         try:
-            response = self.client.get_send_quota()
+            response = self._get_send_quota()
             max_24hr = response.get('Max24HourSend', 0)
             sent_24hr = response.get('SentLast24Hours', 0)
             return True, (
@@ -57,22 +262,46 @@ class EmailSender:
         except Exception as e:
             return False, f"Connection error: {str(e)}"
 
+    def _get_send_quota(self) -> Dict:
+        """SES get_send_quota, reused for up to _QUOTA_TTL seconds (errors are not cached)."""
+        now = time.monotonic()
+        if self._quota and now - self._quota[0] < self._QUOTA_TTL:
+            return self._quota[1]
+        response = self.client.get_send_quota()
+        self._quota = (now, response)
+        return response
+
+    def get_max_send_rate(self) -> Optional[float]:
+        """Return the account's SES MaxSendRate (emails/second), or None if unavailable."""
+        try:
+            rate = float(self._get_send_quota().get('MaxSendRate', 0))
+        except Exception:
+            return None
+        return rate if rate > 0 else None
+
     def send_email(
         self,
         recipient_email: str,
         subject: str,
-        html_body: str
+        html_body: str,
+        text_body: Optional[str] = None
     ) -> Tuple[bool, str]:
-        """Send a single email via AWS SES"""
-        try:
-            # Create plain text version by stripping HTML
-            plain_text = re.sub(r'<[^>]+>', '', html_body)
-            plain_text = re.sub(r'\s+', ' ', plain_text).strip()
+        """Send a single email via AWS SES (the plain-text part is derived from the HTML unless given)"""
+        return self._send_email(recipient_email, subject, html_body, text_body)[:2]
 
-            source = f"{self.sender_name} <{self.sender_email}>"
+    def _send_email(
+        self,
+        recipient_email: str,
+        subject: str,
+        html_body: str,
+        text_body: Optional[str] = None
+    ) -> Tuple[bool, str, Optional[str]]:
+        """send_email, plus the SES error code (None unless SES returned an error) for retries."""
+        try:
+            plain_text = self._plain_text(html_body) if text_body is None else text_body
 
             send_kwargs = {
-                'Source': source,
+                'Source': self._source,
                 'Destination': {
                     'ToAddresses': [recipient_email],
                 },
@@ -99,19 +328,19 @@ class EmailSender:
             response = self.client.send_email(**send_kwargs)
 
             message_id = response.get('MessageId', '')
-            return True, f"Email sent (MessageId: {message_id})"
+            return True, f"Email sent (MessageId: {message_id})", None
 
         except ClientError as e:
             error_code = e.response['Error']['Code']
             error_msg = e.response['Error']['Message']
             if error_code == 'MessageRejected':
-                return False, f"Email rejected: {error_msg}"
+                return False, f"Email rejected: {error_msg}", error_code
             elif error_code == 'MailFromDomainNotVerified':
-                return False, f"Sender domain not verified: {error_msg}"
+                return False, f"Sender domain not verified: {error_msg}", error_code
             else:
-                return False, f"AWS SES error ({error_code}): {error_msg}"
+                return False, f"AWS SES error ({error_code}): {error_msg}", error_code
         except Exception as e:
-            return False, f"Error sending email: {str(e)}"
+            return False, f"Error sending email: {str(e)}", None
 
     def send_email_with_ics(
         self,
@@ -120,49 +349,53 @@ class EmailSender:
         html_body: str,
         ics_content: str,
         ics_filename: str = "calendar_event.ics",
+        text_body: Optional[str] = None,
     ) -> Tuple[bool, str]:
         """Send an email with an ICS calendar attachment via AWS SES send_raw_email."""
-        try:
-            plain_text = re.sub(r'<[^>]+>', '', html_body)
-            plain_text = re.sub(r'\s+', ' ', plain_text).strip()
-
-            source = f"{self.sender_name} <{self.sender_email}>"
-
-            # Build MIME message
-            msg = MIMEMultipart('mixed')
-            msg['Subject'] = subject
-            msg['From'] = source
-            msg['To'] = recipient_email
-            if self.configuration_set:
-                msg['X-SES-CONFIGURATION-SET'] = self.configuration_set
+        return self._send_email_with_ics(
+            recipient_email, subject, html_body, ics_content, ics_filename, text_body,
+        )[:2]
 
-            # Attach HTML + plain text as alternatives
-            body_part = MIMEMultipart('alternative')
-            body_part.attach(MIMEText(plain_text, 'plain', 'utf-8'))
-            body_part.attach(MIMEText(html_body, 'html', 'utf-8'))
-            msg.attach(body_part)
+    def _send_email_with_ics(
+        self,
+        recipient_email: str,
+        subject: str,
+        html_body: str,
+        ics_content: str,
+        ics_filename: str = "calendar_event.ics",
+        text_body: Optional[str] = None,
+    ) -> Tuple[bool, str, Optional[str]]:
+        """send_email_with_ics, plus the SES error code (None unless SES returned an error)."""
+        try:
+            plain_text = self._plain_text(html_body) if text_body is None else text_body
 
-            # Attach ICS file — use MIMEText so encoding is handled correctly (no duplicate headers)
-            cal_part = MIMEText(ics_content, 'calendar', 'utf-8')
-            cal_part.set_param('method', 'REQUEST')
-            cal_part.add_header('Content-Disposition', 'attachment', filename=ics_filename)
-            msg.attach(cal_part)
+            # HTML + plain text as alternatives, with the ICS file attached
+            raw_message = _render_calendar_mime(
+                source=self._source,
+                recipient=recipient_email,
+                subject=subject,
+                configuration_set=self.configuration_set,
+                plain_text=plain_text,
+                html_body=html_body,
+                ics_content=ics_content,
+                ics_filename=ics_filename,
+            )
 
             response = self.client.send_raw_email(
-                Source=source,
+                Source=self._source,
                 Destinations=[recipient_email],
-                RawMessage={'Data': msg.as_string()},
+                RawMessage={'Data': raw_message},
             )
 
             message_id = response.get('MessageId', '')
-            return True, f"Email with calendar invite sent (MessageId: {message_id})"
+            return True, f"Email with calendar invite sent (MessageId: {message_id})", None
 
         except ClientError as e:
             error_code = e.response['Error']['Code']
             error_msg = e.response['Error']['Message']
-            return False, f"AWS SES error ({error_code}): {error_msg}"
+            return False, f"AWS SES error ({error_code}): {error_msg}", error_code
         except Exception as e:
-            return False, f"Error sending email: {str(e)}"
+            return False, f"Error sending email: {str(e)}", None
 
     def send_bulk_emails(
         self,
@@ -174,15 +407,26 @@ class EmailSender:
         calendar_event_config: Optional[Dict] = None,
         checkpoint_interval: int = 10,
         resume_from_checkpoint: bool = False,
+        max_workers: int = 1,
+        max_retries: int = 3,
     ) -> List[Dict]:
         """
         Send emails to multiple recipients via AWS SES with crash resilience.
 
         Features:
-        - Saves checkpoint to disk every `checkpoint_interval` emails
+        - Saves checkpoint to disk every `checkpoint_interval` emails (results are appended
+          to a JSONL log, so each checkpoint writes only the new rows)
         - On crash, auto-generates a partial report CSV
         - Can resume from last checkpoint if `resume_from_checkpoint` is True
         - Each email send is wrapped in try/except to prevent single failures from crashing the loop
+        - Up to `max_workers` sends are in flight at once; sends are rate-limited by a
+          token bucket at the account's SES MaxSendRate (and no faster than one per `delay`
+          seconds when `delay` > 0)
+        - Throttled or transiently failing sends are retried up to `max_retries` times with
+          jittered exponential backoff
+        - Without a calendar invite, emails go out through a temporary SES template with
+          SendBulkTemplatedEmail, 50 recipients per call; if the template can't be created
+          (permissions, literal `{{` in the template) each email is sent individually
 
         For each student:
         1. Replace placeholders in template
@@ -190,23 +434,31 @@ class EmailSender:
         3. Update student dict with email_status
         4. Call progress_callback if provided
         5. Save checkpoint periodically
-        6. Add delay between emails
+
+        Results, progress callbacks and checkpoints are handled on the calling thread in
+        student order, so a checkpoint's `next_index` always marks a contiguous prefix.
+        If the loop raises, sends already under way are awaited and recorded before the
+        crash checkpoint. If the process is killed outright, the emails sent after the last
+        checkpoint are re-sent on resume: up to `checkpoint_interval` + 2 * `max_workers`
+        individual emails, or `max_workers` bulk batches.
 
         calendar_event_config keys:
             event_type, title, date_str, start_time_str, duration_str,
             organizer_name, organizer_email, location, meeting_link, description
         """
-        from modules.calendar_event import CalendarEvent
-
         # Ensure reports directory exists
         os.makedirs(CHECKPOINT_DIR, exist_ok=True)
 
-        # Generate session ID for this send operation
-        session_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Generate session ID for this send operation; started_at stays fixed for the session
+        now = datetime.now()
+        session_id = now.strftime('%Y%m%d_%H%M%S')
+        started_at = now.strftime('%Y-%m-%d %H:%M:%S')
         checkpoint_file = os.path.join(CHECKPOINT_DIR, f'checkpoint_{session_id}.json')
 
         results = []
         start_index = 0
+        # Running totals, kept in the checkpoint header so nothing has to rescan the results
+        sent_count = failed_count = 0
 
         # Resume from checkpoint if requested
         if resume_from_checkpoint:
@@ -216,10 +468,10 @@ class EmailSender:
                 start_index = checkpoint_data.get('next_index', 0)
                 session_id = checkpoint_data.get('session_id', session_id)
                 checkpoint_file = checkpoint_data.get('checkpoint_file', checkpoint_file)
+                started_at = checkpoint_data.get('started_at', started_at)
+                sent_count, failed_count = self._count_results({'results': results})
                 # Notify via callback about already-sent emails
                 if progress_callback and results:
-                    sent_count = len([r for r in results if r['email_status'] == 'sent'])
-                    failed_count = len([r for r in results if r['email_status'] == 'failed'])
                     progress_callback(
                         start_index, len(students),
                         f"(resumed — {start_index} already processed)",
@@ -227,113 +479,145 @@ class EmailSender:
                         f"Resuming: {sent_count} sent, {failed_count} failed previously"
                     )
 
-        # Save initial checkpoint with all students marked pending
+        # Start the results log from what's already processed, then save the initial checkpoint
+        self._write_results_log(checkpoint_file, results)
+        flushed = len(results)
         self._save_checkpoint(checkpoint_file, {
             'session_id': session_id,
             'checkpoint_file': checkpoint_file,
             'total_students': len(students),
             'next_index': start_index,
-            'results': results,
-            'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'sent_count': sent_count,
+            'failed_count': failed_count,
+            'started_at': started_at,
             'status': 'in_progress',
         })
 
-        try:
-            for i in range(start_index, len(students)):
-                student = students[i]
+        # Rate-limit by the account's SES send rate. SES allows bursts up to MaxSendRate
+        # within a second; a user delay slower than that spaces sends evenly instead.
+        max_rate = self.get_max_send_rate() or 0.0
+        rate, capacity = max_rate, max_rate
+        if delay > 0 and (not max_rate or 1.0 / delay < max_rate):
+            rate, capacity = 1.0 / delay, 1.0
+        bucket = _TokenBucket(rate, capacity)
+        workers = max(1, int(max_workers))
+
+        # Build the invite once; only the UID and attendee line differ per recipient
+        calendar = self._prepare_calendar(calendar_event_config) if calendar_event_config else None
+
+        # Bulk templated sends can't carry attachments, so invites go one by one
+        template_name = None if calendar else self._create_bulk_template(subject, html_template)
+        batch_size = _BULK_BATCH_SIZE if template_name else 1
+        # Strip the HTML once; each recipient's plain-text part is then just a placeholder fill
+        text_template = None if template_name else self._plain_text(html_template)
+
+        writer = _CheckpointWriter(checkpoint_file)
+        # A templated future carries a whole batch, so keep fewer of them in flight
+        window = workers if template_name else workers * 2
+
+        def record(student, success, message):
+            nonlocal sent_count, failed_count
+            # Result row: the full student record (reports and resume need every
+            # column) plus the send outcome, built in a single dict display
+            results.append({
+                **student,
+                'email_status': 'sent' if success else 'failed',
+                'email_message': message,
+                'send_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            })
+            if success:
+                sent_count += 1
+            else:
+                failed_count += 1
 
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                in_flight = deque()
+                outcomes = deque()
+                next_to_submit = start_index
+                i = start_index
                 try:
-                    # Replace placeholders in the template
-                    personalized_html = self._replace_placeholders(html_template, student)
-                    personalized_subject = self._replace_placeholders(subject, student)
-
-                    # Attempt to send
-                    if calendar_event_config:
-                        # Generate personalized ICS for this student
-                        ics_content, ics_error = CalendarEvent.generate_ics(
-                            event_type=calendar_event_config.get('event_type', CalendarEvent.EVENT_TYPE_GOOGLE),
-                            title=calendar_event_config.get('title', 'Exam Session'),
-                            date_str=calendar_event_config.get('date_str', ''),
-                            start_time_str=calendar_event_config.get('start_time_str', ''),
-                            duration_str=calendar_event_config.get('duration_str', '1 hour'),
-                            organizer_name=calendar_event_config.get('organizer_name', self.sender_name),
-                            organizer_email=calendar_event_config.get('organizer_email', self.sender_email),
-                            attendee_name=student.get('name', ''),
-                            attendee_email=student.get('email', ''),
-                            location=calendar_event_config.get('location', ''),
-                            meeting_link=calendar_event_config.get('meeting_link', ''),
-                            description=calendar_event_config.get('description', ''),
-                        )
-
-                        if ics_error or not ics_content:
-                            success, message = False, f"Calendar event generation failed: {ics_error}"
-                        else:
-                            event_type = calendar_event_config.get('event_type', CalendarEvent.EVENT_TYPE_GOOGLE)
-                            ics_filename = (
-                                "google_meet_event.ics"
-                                if event_type == CalendarEvent.EVENT_TYPE_GOOGLE
-                                else "outlook_meeting.ics"
-                            )
-                            success, message = self.send_email_with_ics(
-                                recipient_email=student['email'],
-                                subject=personalized_subject,
-                                html_body=personalized_html,
-                                ics_content=ics_content,
-                                ics_filename=ics_filename,
-                            )
-                    else:
-                        success, message = self.send_email(
-                            recipient_email=student['email'],
-                            subject=personalized_subject,
-                            html_body=personalized_html,
-                        )
-
-                except Exception as e:
-                    # Catch any unexpected error for THIS email, don't crash the whole loop
-                    success = False
-                    message = f"Unexpected error: {str(e)}"
-
-                # Update student record
-                student_result = student.copy()
-                student_result['email_status'] = 'sent' if success else 'failed'
-                student_result['email_message'] = message
-                student_result['send_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
-                results.append(student_result)
-
-                # Progress callback
-                if progress_callback:
-                    progress_callback(i + 1, len(students), student['email'], success, message)
-
-                # Save checkpoint every N emails
-                if (i + 1) % checkpoint_interval == 0 or (i + 1) == len(students):
-                    self._save_checkpoint(checkpoint_file, {
-                        'session_id': session_id,
-                        'checkpoint_file': checkpoint_file,
-                        'total_students': len(students),
-                        'next_index': i + 1,
-                        'results': results,
-                        'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'status': 'in_progress',
-                    })
-
-                # Delay between emails (skip after the last one)
-                if i < len(students) - 1:
-                    time.sleep(delay)
+                    while i < len(students):
+                        # Keep a bounded window of sends in flight; results are consumed in order
+                        while next_to_submit < len(students) and len(in_flight) < window:
+                            chunk = students[next_to_submit:next_to_submit + batch_size]
+                            if template_name:
+                                in_flight.append(pool.submit(
+                                    self._send_templated_batch, chunk, template_name, bucket, max_retries,
+                                ))
+                            else:
+                                in_flight.append(pool.submit(
+                                    self._send_to_student, chunk[0], subject,
+                                    html_template, text_template, calendar, bucket, max_retries,
+                                ))
+                            next_to_submit += len(chunk)
+
+                        result = in_flight.popleft().result()
+                        outcomes.extend(result if template_name else [result])
+
+                        while outcomes:
+                            success, message = outcomes.popleft()
+                            student = students[i]
+                            record(student, success, message)
+                            i += 1
+
+                            # Progress callback
+                            if progress_callback:
+                                progress_callback(i, len(students), student['email'], success, message)
+
+                        # Save checkpoint every N emails, and after every bulk batch so a
+                        # resume never re-sends a batch SES already accepted
+                        if template_name or i % checkpoint_interval == 0 or i == len(students):
+                            writer.submit(results[flushed:], {
+                                'session_id': session_id,
+                                'checkpoint_file': checkpoint_file,
+                                'total_students': len(students),
+                                'next_index': i,
+                                'sent_count': sent_count,
+                                'failed_count': failed_count,
+                                'started_at': started_at,
+                                'status': 'in_progress',
+                            })
+                            flushed = len(results)
+                except Exception:
+                    # Don't start sends whose results can no longer be recorded, but record
+                    # the ones already under way so the crash checkpoint doesn't re-send them
+                    for future in in_flight:
+                        future.cancel()
+                    while outcomes:
+                        record(students[i], *outcomes.popleft())
+                        i += 1
+                    for future in in_flight:
+                        if future.cancelled():
+                            break
+                        try:
+                            result = future.result()
+                        except Exception:
+                            break
+                        for success, message in (result if template_name else [result]):
+                            record(students[i], success, message)
+                            i += 1
+                    raise
+                finally:
+                    if template_name:
+                        self._delete_bulk_template(template_name)
 
         except Exception as e:
             # CRASH HANDLER: save whatever we have so far
-            crash_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            sent_count = len([r for r in results if r['email_status'] == 'sent'])
-            failed_count = len([r for r in results if r['email_status'] == 'failed'])
+            crashed_at = datetime.now()
             remaining = len(students) - len(results)
+            writer.close()
+            self._append_results_log(checkpoint_file, results[flushed:])
 
             # Mark remaining students as 'not_sent'
+            crash_message = f'Process crashed at email {len(results)}/{len(students)}'
             for j in range(len(results), len(students)):
-                student_result = students[j].copy()
-                student_result['email_status'] = 'not_sent'
-                student_result['email_message'] = f'Process crashed at email {len(results)}/{len(students)}'
-                student_result['send_time'] = ''
-                results.append(student_result)
+                results.append({
+                    **students[j],
+                    'email_status': 'not_sent',
+                    'email_message': crash_message,
+                    'send_time': '',
+                })
 
             # Save crash checkpoint
             self._save_checkpoint(checkpoint_file, {
@@ -341,26 +625,31 @@ class EmailSender:
                 'checkpoint_file': checkpoint_file,
                 'total_students': len(students),
                 'next_index': len(results) - remaining,  # Resume point
-                'results': results[:len(results) - remaining],  # Only actually processed
-                'started_at': crash_time,
+                'sent_count': sent_count,
+                'failed_count': failed_count,
+                'started_at': started_at,
+                'crashed_at': crashed_at.strftime('%Y-%m-%d %H:%M:%S'),
                 'status': 'crashed',
                 'crash_error': str(e),
             })
 
             # Auto-generate crash report CSV
-            self._generate_crash_report(results, session_id, str(e), sent_count, failed_count, remaining)
+            self._generate_crash_report(results, session_id, str(e), sent_count, failed_count, remaining,
+                                        crashed_at)
 
             # Re-raise so the caller knows about the crash but results are saved
             raise
 
         # Completed successfully — update checkpoint status and clean up
+        writer.close()
         self._save_checkpoint(checkpoint_file, {
             'session_id': session_id,
             'checkpoint_file': checkpoint_file,
             'total_students': len(students),
             'next_index': len(students),
-            'results': results,
-            'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'sent_count': sent_count,
+            'failed_count': failed_count,
+            'started_at': started_at,
             'status': 'completed',
         })
 
@@ -369,8 +658,249 @@ class EmailSender:
 
         return results
 
+    @staticmethod
+    def _to_ses_template(text: str) -> str:
+        """Rewrite {placeholder}s as SES (Handlebars) {{{placeholder}}}, unescaped like ours."""
+        # Same click-tracking opt-out _replace_placeholders applies per recipient
+        text = text.replace('<a href="{login_link}"', '<a ses:no-track href="{login_link}"')
+        return _PLACEHOLDER_RE.sub(lambda m: '{{{' + m.group(1) + '}}}', text)
+
+    def _create_bulk_template(self, subject: str, html_template: str) -> Optional[str]:
+        """Register the email as a temporary SES template. Returns its name, or None to send individually."""
+        if '{{' in subject or '{{' in html_template:
+            return None  # literal Handlebars syntax would be misread by SES
+        html_part = self._to_ses_template(html_template)
+        # The text part reads <key>_text variables: values stripped like the text itself
+        text_part = _PLACEHOLDER_RE.sub(
+            lambda m: '{{{' + m.group(1) + '_text}}}', self._plain_text(html_template),
+        )
+        name = f"exam-sender-{uuid.uuid4().hex}"
+        try:
+            self.client.create_template(Template={
+                'TemplateName': name,
+                'SubjectPart': self._to_ses_template(subject),
+                'HtmlPart': html_part,
+                'TextPart': text_part,
+            })
+        except ClientError as e:
+            # Typically a missing ses:CreateTemplate permission or the account's template quota
+            logger.warning(
+                "SES CreateTemplate failed (%s): %s; sending emails one by one",
+                e.response['Error']['Code'], e.response['Error']['Message'],
+            )
+            return None
+        except Exception as e:
+            logger.warning("SES CreateTemplate failed: %s; sending emails one by one", e)
+            return None
+        return name
+
+    def _delete_bulk_template(self, name: str):
+        try:
+            self.client.delete_template(TemplateName=name)
+        except ClientError as e:
+            # The template stays behind and counts against the account's template quota
+            logger.warning(
+                "SES DeleteTemplate failed for %s (%s): %s",
+                name, e.response['Error']['Code'], e.response['Error']['Message'],
+            )
+        except Exception as e:
+            logger.warning("SES DeleteTemplate failed for %s: %s", name, e)
+
+    def _send_templated_batch(
+        self,
+        students: List[Dict],
+        template_name: str,
+        bucket: _TokenBucket,
+        max_retries: int = 3,
+    ) -> List[Tuple[bool, str]]:
+        """Send one SendBulkTemplatedEmail call. Runs on a worker thread; never raises."""
+        send_kwargs = {
+            'Source': self._source,
+            'Template': template_name,
+            'DefaultTemplateData': json.dumps(self._bulk_template_data(dict.fromkeys(_PLACEHOLDERS, ''))),
+            'Destinations': [
+                {
+                    'Destination': {'ToAddresses': [student['email']]},
+                    'ReplacementTemplateData': json.dumps(
+                        self._bulk_template_data(self._placeholder_values(student)), ensure_ascii=False,
+                    ),
+                }
+                for student in students
+            ],
+        }
+        if self.configuration_set:
+            send_kwargs['ConfigurationSetName'] = self.configuration_set
+
+        for attempt in range(max_retries + 1):
+            # Every destination counts against the account's send rate
+            bucket.acquire(len(students))
+            try:
+                response = self.client.send_bulk_templated_email(**send_kwargs)
+                break
+            except ClientError as e:
+                error_code = e.response['Error']['Code']
+                error_msg = e.response['Error']['Message']
+                if error_code in _RETRYABLE_ERRORS and attempt < max_retries:
+                    if error_code in _THROTTLING_ERRORS:
+                        bucket.throttled()
+                    time.sleep(_backoff_delay(attempt))
+                    continue
+                return [(False, f"AWS SES error ({error_code}): {error_msg}")] * len(students)
+            except Exception as e:
+                return [(False, f"Error sending email: {str(e)}")] * len(students)
+
+        outcomes = []
+        for status in response.get('Status', []):
+            if status.get('Status') == 'Success':
+                outcomes.append((True, f"Email sent (MessageId: {status.get('MessageId', '')})"))
+            else:
+                outcomes.append((False, f"AWS SES error ({status.get('Status')}): {status.get('Error', '')}"))
+        outcomes += [(False, "No delivery status returned by AWS SES")] * (len(students) - len(outcomes))
+        return outcomes[:len(students)]
+
+    def _prepare_calendar(self, calendar_event_config: Dict) -> tuple:
+        """Prebuild the ICS template for a send. Returns (template, error, ics_filename)."""
+        from modules.calendar_event import CalendarEvent
+
+        event_type = calendar_event_config.get('event_type', CalendarEvent.EVENT_TYPE_GOOGLE)
+        template, error = CalendarEvent.prebuild_template(
+            event_type=event_type,
+            title=calendar_event_config.get('title', 'Exam Session'),
+            date_str=calendar_event_config.get('date_str', ''),
+            start_time_str=calendar_event_config.get('start_time_str', ''),
+            duration_str=calendar_event_config.get('duration_str', '1 hour'),
+            organizer_name=calendar_event_config.get('organizer_name', self.sender_name),
+            organizer_email=calendar_event_config.get('organizer_email', self.sender_email),
+            location=calendar_event_config.get('location', ''),
+            meeting_link=calendar_event_config.get('meeting_link', ''),
+            description=calendar_event_config.get('description', ''),
+        )
+        ics_filename = (
+            "google_meet_event.ics"
+            if event_type == CalendarEvent.EVENT_TYPE_GOOGLE
+            else "outlook_meeting.ics"
+        )
+        return template, error, ics_filename
+
+    def _send_to_student(
+        self,
+        student: Dict,
+        subject: str,
+        html_template: str,
+        text_template: str,
+        calendar: Optional[tuple],
+        bucket: _TokenBucket,
+        max_retries: int = 3,
+    ) -> Tuple[bool, str]:
+        """Personalize and send one email. Runs on a worker thread; never raises."""
+        from modules.calendar_event import CalendarEvent
+
+        try:
+            # Replace placeholders in the template
+            values = self._placeholder_values(student)
+            personalized_html = self._replace_placeholders(html_template, student, values)
+            personalized_subject = self._replace_placeholders(subject, student, values)
+            # The template was stripped once up front; values get the same treatment so
+            # markup or entities in them don't land raw in the text part. Re-collapse
+            # whitespace: an empty value can leave two spaces behind.
+            personalized_text = _WS_RE.sub(
+                ' ', self._replace_placeholders(text_template, student, self._plain_text_values(values))
+            ).strip()
+
+            ics_content = ics_filename = None
+            if calendar:
+                # Personalize the prebuilt ICS for this student
+                ics_template, ics_error, ics_filename = calendar
+                if ics_error or not ics_template:
+                    return False, f"Calendar event generation failed: {ics_error}"
+                ics_content = CalendarEvent.render_ics(
+                    ics_template, student.get('name', ''), student.get('email', ''),
+                )
+
+            for attempt in range(max_retries + 1):
+                # Attempt to send, respecting the shared rate limit
+                bucket.acquire()
+                if ics_content:
+                    success, message, error_code = self._send_email_with_ics(
+                        recipient_email=student['email'],
+                        subject=personalized_subject,
+                        html_body=personalized_html,
+                        ics_content=ics_content,
+                        ics_filename=ics_filename,
+                        text_body=personalized_text,
+                    )
+                else:
+                    success, message, error_code = self._send_email(
+                        recipient_email=student['email'],
+                        subject=personalized_subject,
+                        html_body=personalized_html,
+                        text_body=personalized_text,
+                    )
+                if success or error_code not in _RETRYABLE_ERRORS or attempt == max_retries:
+                    break
+                if error_code in _THROTTLING_ERRORS:
+                    bucket.throttled()
+                time.sleep(_backoff_delay(attempt))
+
+        except Exception as e:
+            # Catch any unexpected error for THIS email, don't crash the whole loop
+            success = False
+            message = f"Unexpected error: {str(e)}"
+
+        return success, message
+
     # ─── Checkpoint & Recovery Methods ────────────────────────────────────────
 
+    # A checkpoint is a small JSON header (session info, next_index, status) plus an
+    # append-only `<checkpoint>.results.jsonl` log with one processed result per line.
+
+    @staticmethod
+    def _results_log_path(checkpoint_file: str) -> str:
+        return os.path.splitext(checkpoint_file)[0] + '.results.jsonl'
+
+    @staticmethod
+    def _write_results_log(checkpoint_file: str, rows: List[Dict]):
+        """(Re)create the results log holding exactly `rows`."""
+        path = EmailSender._results_log_path(checkpoint_file)
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _append_results_log(checkpoint_file: str, rows: List[Dict]):
+        """Append newly processed results to the log and flush them to disk."""
+        if not rows:
+            return
+        try:
+            with open(EmailSender._results_log_path(checkpoint_file), 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows))
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception:
+            pass
+
+    @staticmethod
+    def _read_results_log(checkpoint_file: str, limit: int) -> List[Dict]:
+        """Read the first `limit` results (rows past the header's next_index weren't committed)."""
+        results = []
+        try:
+            with open(EmailSender._results_log_path(checkpoint_file), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if len(results) >= limit:
+                        break
+                    if line.strip():
+                        results.append(json.loads(line))
+        except (OSError, ValueError):
+            pass
+        return results
+
     @staticmethod
     def _save_checkpoint(filepath: str, data: dict):
         """Save checkpoint data to a JSON file atomically."""
@@ -378,6 +908,8 @@ class EmailSender:
         try:
             with open(temp_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
             # Atomic rename to prevent corruption
             os.replace(temp_path, filepath)
         except Exception:
@@ -385,9 +917,31 @@ class EmailSender:
             pass
 
     @staticmethod
-    def _load_latest_checkpoint() -> Optional[Dict]:
-        """Load the most recent checkpoint file that is resumable (in_progress or crashed)."""
+    def _find_resumable_checkpoint() -> Optional[Dict]:
+        """Load the header of the most recent resumable (in_progress or crashed) checkpoint."""
         os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        dir_mtime = os.stat(CHECKPOINT_DIR).st_mtime_ns
+        cached = _RESUMABLE_CACHE.get(CHECKPOINT_DIR)
+        if cached and cached[0] == dir_mtime:
+            header, header_mtime = cached[1], cached[2]
+            if header is None:
+                return None
+            try:
+                if os.stat(header['checkpoint_file']).st_mtime_ns == header_mtime:
+                    return dict(header)
+            except OSError:
+                pass
+
+        data = EmailSender._scan_resumable_checkpoint()
+        try:
+            header_mtime = os.stat(data['checkpoint_file']).st_mtime_ns if data else None
+        except OSError:
+            header_mtime = None
+        _RESUMABLE_CACHE[CHECKPOINT_DIR] = (dir_mtime, data and dict(data), header_mtime)
+        return data
+
+    @staticmethod
+    def _scan_resumable_checkpoint() -> Optional[Dict]:
         checkpoint_files = sorted(
             [f for f in os.listdir(CHECKPOINT_DIR) if f.startswith('checkpoint_') and f.endswith('.json')],
             reverse=True
@@ -404,18 +958,51 @@ class EmailSender:
                 continue
         return None
 
+    @staticmethod
+    def _load_latest_checkpoint() -> Optional[Dict]:
+        """Load the most recent checkpoint file that is resumable (in_progress or crashed)."""
+        data = EmailSender._find_resumable_checkpoint()
+        if data and 'results' not in data:  # older checkpoints embed the results
+            data['results'] = EmailSender._read_results_log(data['checkpoint_file'], data.get('next_index', 0))
+        return data
+
+    @staticmethod
+    def _count_results(data: Dict) -> Tuple[int, int]:
+        """(sent, failed) among a checkpoint's committed results, cached until its log changes."""
+        if 'sent_count' in data:  # running totals saved alongside next_index
+            return data['sent_count'], data['failed_count']
+
+        def count(results: List[Dict]) -> Tuple[int, int]:
+            sent = sum(1 for r in results if r.get('email_status') == 'sent')
+            failed = sum(1 for r in results if r.get('email_status') == 'failed')
+            return sent, failed
+
+        if 'results' in data:  # older checkpoints embed the results
+            return count(data['results'])
+
+        fpath, limit = data['checkpoint_file'], data.get('next_index', 0)
+        try:
+            stat = os.stat(EmailSender._results_log_path(fpath))
+            signature = (limit, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = (limit, None, None)
+        cached = _RESULT_COUNTS_CACHE.get(fpath)
+        if cached and cached[0] == signature:
+            return cached[1]
+        counts = count(EmailSender._read_results_log(fpath, limit))
+        _RESULT_COUNTS_CACHE[fpath] = (signature, counts)
+        return counts
+
     @staticmethod
     def get_resumable_session() -> Optional[Dict]:
         """Public method to check if there's a resumable session. Returns summary info."""
-        data = EmailSender._load_latest_checkpoint()
+        data = EmailSender._find_resumable_checkpoint()
         if not data:
             return None
 
-        results = data.get('results', [])
         total = data.get('total_students', 0)
         processed = data.get('next_index', 0)
-        sent = len([r for r in results if r.get('email_status') == 'sent'])
-        failed = len([r for r in results if r.get('email_status') == 'failed'])
+        sent, failed = EmailSender._count_results(data)
 
         return {
             'session_id': data.get('session_id', ''),
@@ -438,32 +1025,38 @@ class EmailSender:
                 with open(checkpoint_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 data['status'] = 'cleared'
-                with open(checkpoint_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                EmailSender._save_checkpoint(checkpoint_file, data)
             except Exception:
                 pass
 
+    @staticmethod
+    def _write_results_csv(path: str, results: List[Dict]):
+        """Write result rows as CSV, one column per key seen (first-seen order)."""
+        keys = tuple(dict.fromkeys(key for row in results for key in row))
+        with open(path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(keys)
+            writer.writerows(tuple(row.get(key, '') for key in keys) for row in results)
+
     @staticmethod
     def _generate_crash_report(results: List[Dict], session_id: str, error: str,
-                                sent_count: int, failed_count: int, remaining: int):
+                                sent_count: int, failed_count: int, remaining: int,
+                                crashed_at: Optional[datetime] = None):
         """Generate a CSV crash report so data is never lost."""
         os.makedirs(CHECKPOINT_DIR, exist_ok=True)
-        readable_time = datetime.now().strftime('%d %b %Y %I-%M %p')
+        crashed_at = crashed_at or datetime.now()
+        readable_time = crashed_at.strftime('%d %b %Y %I-%M %p')
         report_path = os.path.join(CHECKPOINT_DIR, f'Crash Report - {readable_time}.csv')
         try:
             if results:
-                keys = results[0].keys()
-                with open(report_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=keys)
-                    writer.writeheader()
-                    writer.writerows(results)
+                EmailSender._write_results_csv(report_path, results)
 
             # Also write a summary text file
             summary_path = os.path.join(CHECKPOINT_DIR, f'Crash Summary - {readable_time}.txt')
             with open(summary_path, 'w', encoding='utf-8') as f:
                 f.write(f"═══ EMAIL SENDING CRASH REPORT ═══\n")
                 f.write(f"Session ID: {session_id}\n")
-                f.write(f"Crash Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+                f.write(f"Crash Time: {crashed_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write(f"Error: {error}\n")
                 f.write(f"──────────────────────────────────\n")
                 f.write(f"Total Emails: {sent_count + failed_count + remaining}\n")
@@ -484,11 +1077,7 @@ class EmailSender:
         report_path = os.path.join(CHECKPOINT_DIR, f'Email Report - {readable_time}.csv')
         try:
             if results:
-                keys = results[0].keys()
-                with open(report_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=keys)
-                    writer.writeheader()
-                    writer.writerows(results)
+                EmailSender._write_results_csv(report_path, results)
                 EmailSender._prune_old_reports()
         except Exception:
             pass
@@ -512,28 +1101,44 @@ class EmailSender:
             pass
 
     @staticmethod
-    def _replace_placeholders(text: str, data: Dict) -> str:
-        """Replace {placeholder} with actual values"""
-        replacements = {
-            '{name}': str(data.get('name', '')),
-            '{email}': str(data.get('email', '')),
-            '{login_link}': str(data.get('login_link', '')),
-            '{candidate_id}': str(data.get('candidate_id', '')),
-            '{program_name}': str(data.get('program_name', '')),
-            '{round_name}': str(data.get('round_name', '')),
-            '{expires_at}': str(data.get('expires_at', '')),
-            '{session_duration}': str(data.get('session_duration', '')),
-            '{login_id}': str(data.get('login_id', '')),
-            '{password}': str(data.get('password', '')),
+    def _plain_text(html: str) -> str:
+        """Plain-text alternative for an HTML body: tags stripped, entities decoded, whitespace collapsed."""
+        text = _TAG_RE.sub('', _NON_TEXT_RE.sub('', html))
+        return _WS_RE.sub(' ', html_lib.unescape(text)).strip()
+
+    @staticmethod
+    def _bulk_template_data(values: Dict[str, str]) -> Dict[str, str]:
+        """SES template data: the values for the HTML part plus <key>_text ones for the text part."""
+        data = dict(values)
+        for key, value in EmailSender._plain_text_values(values).items():
+            data[key + '_text'] = value
+        return data
+
+    @staticmethod
+    def _plain_text_values(values: Dict[str, str]) -> Dict[str, str]:
+        """Placeholder values as they'd read in the plain-text part (only markup/entities change)."""
+        return {
+            key: EmailSender._plain_text(value) if '<' in value or '&' in value else value
+            for key, value in values.items()
         }
 
-        result = text
-        for placeholder, value in replacements.items():
-            result = result.replace(placeholder, value)
+    @staticmethod
+    def _placeholder_values(data: Dict) -> Dict[str, str]:
+        """String value for every placeholder, built once per recipient."""
+        return {key: str(data.get(key, '')) for key in _PLACEHOLDERS}
+
+    @staticmethod
+    def _replace_placeholders(text: str, data: Dict, values: Optional[Dict[str, str]] = None) -> str:
+        """Replace {placeholder} with actual values (pass `values` to reuse them across texts)"""
+        if values is None:
+            values = EmailSender._placeholder_values(data)
+        parts = list(split_placeholders(text, _PLACEHOLDER_RE))
+        parts[1::2] = [values[key] for key in parts[1::2]]
+        result = ''.join(parts)
 
         # Add ses:no-track to <a> tags containing the login_link to prevent
         # AWS SES click tracking from rewriting the URL
-        login_link = str(data.get('login_link', ''))
+        login_link = values['login_link']
         if login_link:
             result = result.replace(
                 f'<a href="{login_link}"',
@@ -541,3 +1146,43 @@ class EmailSender:
             )
 
         return result
+
+
+class BulkSendWorker:
+    """
+    Runs `EmailSender.send_bulk_emails` on a daemon thread so a Streamlit rerun
+    (any widget interaction) doesn't interrupt an in-progress send.
+
+    Progress callbacks are queued as (current, total, email, success, message)
+    tuples for the UI thread to `drain()`. When the thread finishes, `results`
+    holds the returned list, or `error` the exception it raised.
+    """
+
+    def __init__(self, sender: EmailSender, **send_kwargs):
+        self.events = queue.Queue()
+        self.results: Optional[List[Dict]] = None
+        self.error: Optional[Exception] = None
+        send_kwargs['progress_callback'] = lambda *event: self.events.put(event)
+        self._thread = threading.Thread(
+            target=self._run, args=(sender, send_kwargs), name='bulk-send', daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, sender: EmailSender, send_kwargs: Dict):
+        try:
+            self.results = sender.send_bulk_emails(**send_kwargs)
+        except Exception as e:
+            self.error = e
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def drain(self) -> List[tuple]:
+        """Return all progress events queued since the last call."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
@@ -2,7 +2,10 @@
 
 import pandas as pd
 import re
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+_EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+_EMAIL_RE = re.compile(_EMAIL_PATTERN)
 
 
 class FileHandler:
@@ -10,8 +13,7 @@ class FileHandler:
     @staticmethod
     def validate_email(email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, str(email).strip()) is not None
+        return _EMAIL_RE.match(str(email).strip()) is not None
 
     @staticmethod
     def _clean_value(val) -> str:
@@ -23,14 +25,14 @@ class FileHandler:
         return str(val).strip()
 
     @staticmethod
-    def read_file(file) -> pd.DataFrame:
-        """Read CSV or Excel file"""
+    def read_file(file, nrows: Optional[int] = None) -> pd.DataFrame:
+        """Read CSV or Excel file (only the first `nrows` data rows, if given)"""
         filename = file.name.lower()
 
         if filename.endswith('.csv'):
-            df = pd.read_csv(file)
+            df = pd.read_csv(file, nrows=nrows)
         elif filename.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file)
+            df = pd.read_excel(file, nrows=nrows)
         else:
             raise ValueError("Unsupported file format. Please upload CSV or Excel files.")
 
@@ -38,9 +40,9 @@ class FileHandler:
 
     @staticmethod
     def get_file_columns(file) -> List[str]:
-        """Read a file and return its column names (normalized to lowercase)."""
+        """Read a file's header and return its column names (normalized to lowercase)."""
         try:
-            df = FileHandler.read_file(file)
+            df = FileHandler.read_file(file, nrows=0)
             return [col.strip().lower() for col in df.columns]
         except Exception:
             return []
@@ -73,15 +75,13 @@ class FileHandler:
             'email': ['email', 'email_address', 'e-mail', 'mail', 'email address', 'student_email', 'student email'],
         }
 
+        available = set(df.columns)
         resolved_columns = {}
         for target, options in column_mappings.items():
-            found = False
-            for option in options:
-                if option in df.columns:
-                    resolved_columns[target] = option
-                    found = True
-                    break
-            if not found:
+            match = next((option for option in options if option in available), None)
+            if match:
+                resolved_columns[target] = match
+            else:
                 errors.append(f"Required column '{target}' not found. Available columns: {list(df.columns)}")
 
         if errors:
@@ -89,19 +89,17 @@ class FileHandler:
 
         # Rename columns to standard names
         df = df.rename(columns={v: k for k, v in resolved_columns.items()})
+        available = set(df.columns)
 
         # Handle optional login_id column
         has_login_id = False
-        if login_id_column and login_id_column in df.columns:
+        if login_id_column and login_id_column in available:
             df['login_id'] = df[login_id_column].apply(FileHandler._clean_value)
             has_login_id = True
-        elif login_id_column and login_id_column != df.columns and login_id_column:
-            # Column was selected but renamed — check original mapping
-            pass
 
         # Handle optional password column
         has_password = False
-        if password_column and password_column in df.columns:
+        if password_column and password_column in available:
             df['password'] = df[password_column].apply(FileHandler._clean_value)
             has_password = True
 
@@ -115,36 +113,30 @@ class FileHandler:
         df['email'] = df['email'].astype(str).str.strip().str.lower()
 
         # Remove duplicate emails
-        duplicates = df[df.duplicated(subset=['email'], keep='first')]
-        if len(duplicates) > 0:
-            for _, row in duplicates.iterrows():
-                errors.append(f"Duplicate email removed: {row['email']}")
-            df = df.drop_duplicates(subset=['email'], keep='first')
-
-        # Validate each email
-        valid_students = []
-        for idx, row in df.iterrows():
-            email = row['email']
-            name = row['name']
-
-            if not email or email == 'nan' or email == '':
+        # (one hashing pass: the same mask reports and drops them)
+        dup_mask = df['email'].duplicated(keep='first')
+        if dup_mask.any():
+            errors.extend(f"Duplicate email removed: {email}" for email in df.loc[dup_mask, 'email'].tolist())
+            df = df[~dup_mask]
+
+        # Validate all emails at once; only rejected rows are visited in Python
+        empty = df['email'].isin(['', 'nan'])
+        valid = ~empty & df['email'].str.match(_EMAIL_PATTERN).fillna(False).astype(bool)
+        rejected = df[~valid]
+        for idx, name, email, is_empty in zip(rejected.index, rejected['name'], rejected['email'], empty[~valid]):
+            if is_empty:
                 errors.append(f"Row {idx + 2}: Empty email for '{name}'")
-                continue
-
-            if not FileHandler.validate_email(email):
+            else:
                 errors.append(f"Row {idx + 2}: Invalid email format '{email}'")
-                continue
-
-            student = {
-                'name': name,
-                'email': email,
-            }
-            if has_login_id:
-                student['login_id'] = row.get('login_id', '')
-            if has_password:
-                student['password'] = row.get('password', '')
-
-            valid_students.append(student)
+
+        columns = ['name', 'email']
+        if has_login_id:
+            columns.append('login_id')
+        if has_password:
+            columns.append('password')
+        # Build the row dicts from plain column lists; to_dict('records') boxes every cell
+        kept = df.loc[valid, columns]
+        valid_students = [dict(zip(columns, row)) for row in zip(*(kept[col].tolist() for col in columns))]
 
         if not valid_students:
             errors.append("No valid student records found in the file.")
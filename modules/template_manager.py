@@ -3,8 +3,21 @@
 import os
 import json
 import re
+from functools import lru_cache
 from typing import List, Dict, Optional
 
+# Matches {placeholder} tokens. CSS blocks like "body { margin: 0; }" never match.
+_PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+
+
+@lru_cache(maxsize=64)
+def split_placeholders(text: str, pattern: re.Pattern = _PLACEHOLDER_RE) -> tuple:
+    """Split a template once into [literal, key, literal, key, ..., literal].
+
+    `pattern` must have exactly one group, the placeholder key.
+    """
+    return tuple(pattern.split(text))
+
 
 class TemplateManager:
 
@@ -390,6 +403,13 @@ class TemplateManager:
 
         return placeholders
 
+    @staticmethod
+    def fill_placeholders(text: str, data: Dict) -> str:
+        """Replace {key} tokens from data in a single pass; unknown tokens are left as-is"""
+        parts = list(split_placeholders(text))
+        parts[1::2] = [str(data[key]) if key in data else '{' + key + '}' for key in parts[1::2]]
+        return ''.join(parts)
+
     @staticmethod
     def get_sample_data(
         general_mode: bool = False,
@@ -5,6 +5,7 @@ toolbar. The user can format text, change colours, and then click **Apply**
 to push the edits back into the Streamlit template (`session_state`).
 """
 
+import functools
 import os
 import re
 import streamlit.components.v1 as components
@@ -18,6 +19,16 @@ _COMPONENT_DIR = os.path.join(
 
 _component_func = components.declare_component("visual_editor", path=_COMPONENT_DIR)
 
+# The editor re-renders on every rerun, so its patterns are compiled once here
+_STYLE_RE = re.compile(r'<style[^>]*>(.*?)</style>', re.DOTALL)
+_BODY_SELECTOR_RE = re.compile(r'\bbody\s*\{')
+_BODY_RE = re.compile(r'(<body[^>]*>)(.*?)(</body>)', re.DOTALL)
+# A tag (left as is) or a {placeholder} in the text between tags
+_TAG_OR_PLACEHOLDER_RE = re.compile(r'(<[^>]+>)|\{(\w+)\}')
+_WRAPPED_PLACEHOLDER_RE = re.compile(
+    r'<span[^>]*class="tpl-placeholder"[^>]*data-placeholder="(\w+)"[^>]*>[^<]*</span>'
+)
+
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -28,14 +39,14 @@ def _split_template(html: str) -> dict:
     so the full document can be reconstructed later.
     """
     # Extract all <style> blocks
-    style_blocks = re.findall(r'<style[^>]*>(.*?)</style>', html, re.DOTALL)
+    style_blocks = _STYLE_RE.findall(html)
     styles = '\n'.join(style_blocks) if style_blocks else ''
 
     # Scope the body selector → #editable-content so styles work inside the editor
-    styles = re.sub(r'\bbody\s*\{', '#editable-content {', styles)
+    styles = _BODY_SELECTOR_RE.sub('#editable-content {', styles)
 
     # Extract <body> content
-    body_match = re.search(r'(<body[^>]*>)(.*?)(</body>)', html, re.DOTALL)
+    body_match = _BODY_RE.search(html)
     if body_match:
         body = body_match.group(2).strip()
         prefix = html[:body_match.start(2)]
@@ -54,35 +65,30 @@ def _wrap_placeholders(html: str) -> str:
     Only wraps placeholders that appear in *text content* (between ``>`` and
     ``<``), **not** inside HTML attribute values such as ``href="{link}"``.
     """
-    parts = re.split(r'(<[^>]+>)', html)
-    result = []
-    for part in parts:
-        if part.startswith('<'):
-            result.append(part)          # HTML tag – leave intact
-        else:
-            # Text content – wrap placeholders
-            result.append(
-                re.sub(
-                    r'\{(\w+)\}',
-                    lambda m: (
-                        f'<span contenteditable="false" '
-                        f'class="tpl-placeholder" '
-                        f'data-placeholder="{m.group(1)}">'
-                        f'{m.group(0)}</span>'
-                    ),
-                    part,
-                )
-            )
-    return ''.join(result)
+    def wrap(m):
+        if m.group(1):
+            return m.group(1)            # HTML tag – leave intact
+        return (
+            f'<span contenteditable="false" '
+            f'class="tpl-placeholder" '
+            f'data-placeholder="{m.group(2)}">'
+            f'{m.group(0)}</span>'
+        )
+
+    # One pass: tags are consumed whole, so only text-content placeholders match
+    return _TAG_OR_PLACEHOLDER_RE.sub(wrap, html)
 
 
 def _unwrap_placeholders(html: str) -> str:
     """Strip placeholder span wrappers and restore ``{name}`` syntax."""
-    return re.sub(
-        r'<span[^>]*class="tpl-placeholder"[^>]*data-placeholder="(\w+)"[^>]*>[^<]*</span>',
-        lambda m: '{' + m.group(1) + '}',
-        html,
-    )
+    return _WRAPPED_PLACEHOLDER_RE.sub(lambda m: '{' + m.group(1) + '}', html)
+
+
+@functools.lru_cache(maxsize=8)
+def _prepare_template(html: str) -> tuple:
+    """(styles, wrapped body, prefix, suffix) for *html*, reused while the template is unchanged."""
+    parts = _split_template(html)
+    return parts['styles'], _wrap_placeholders(parts['body']), parts['prefix'], parts['suffix']
 
 
 # ── Public API ───────────────────────────────────────────────────────────────
@@ -103,18 +109,17 @@ def visual_editor(template_html: str, key: str = None):
         The full updated template HTML when the user clicks **Apply Changes**,
         otherwise ``None``.
     """
-    parts = _split_template(template_html)
-    wrapped_body = _wrap_placeholders(parts['body'])
+    styles, wrapped_body, prefix, suffix = _prepare_template(template_html)
 
     result = _component_func(
         body_html=wrapped_body,
-        styles=parts['styles'],
+        styles=styles,
         key=key,
         default=None,
     )
 
     if result and isinstance(result, dict) and 'body_html' in result:
         edited_body = _unwrap_placeholders(result['body_html'])
-        return parts['prefix'] + edited_body + parts['suffix']
+        return prefix + edited_body + suffix
 
     return None